@@ -317,6 +317,39 @@ def ccxt_ohlcv_to_standard(exchange: str, symbol: str, interval: str, ohlcv: lis
     }
 
 
+def ccxt_ohlcv_batch_to_standard(exchange: str, symbol: str, interval: str, ohlcv_rows: list) -> List[Dict]:
+    """Convert a CCXT OHLCV response to standard format
+
+    Same result as calling ccxt_ohlcv_to_standard() per row and dropping
+    incomplete rows, built in a single comprehension.
+
+    Args:
+        exchange: Exchange name
+        symbol: Trading symbol
+        interval: Time interval
+        ohlcv_rows: CCXT OHLCV rows [timestamp, open, high, low, close, volume]
+
+    Returns:
+        List of standardized K-line data dictionaries
+    """
+    return [
+        {
+            "exchange": exchange,
+            "symbol": symbol,
+            "timestamp": row[0],
+            "open": float(row[1]),
+            "high": float(row[2]),
+            "low": float(row[3]),
+            "close": float(row[4]),
+            "volume": float(row[5]),
+            "is_closed": True,  # REST API data is always closed
+            "interval": interval,
+        }
+        for row in ohlcv_rows
+        if len(row) >= 6
+    ]
+
+
 async def fetch_ohlcv(
     exchange: str,
     symbol: str,
@@ -364,13 +397,7 @@ async def fetch_ohlcv(
         raise RuntimeError(f"Failed to fetch data: {e}")
 
     # Convert to standard format
-    klines = []
-    for candle in ohlcv:
-        kline = ccxt_ohlcv_to_standard(exchange, symbol, interval, candle)
-        if kline:
-            klines.append(kline)
-
-    return klines
+    return ccxt_ohlcv_batch_to_standard(exchange, symbol, interval, ohlcv)
 
 
 async def fetch_swap_markets(exchange: str) -> List[Dict]:
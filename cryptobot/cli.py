@@ -4,11 +4,27 @@ Handles user input using Prompt Toolkit
 """
 
 import asyncio
+import codecs
+import contextlib
+import copy
+import functools
+import importlib.util
+import io
+import itertools
+import json
+import multiprocessing
+import operator
+import os
 import re
+import runpy
 import shutil
+import signal
 import subprocess
 import sys
+import time
+import traceback
 from pathlib import Path
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
 from typing import Optional, Tuple
 from datetime import datetime
 
@@ -20,6 +36,8 @@ from rich.console import Console
 from rich.live import Live
 from rich.layout import Layout
 from rich.panel import Panel
+from rich.style import Style
+from rich.table import Table
 from rich.text import Text
 
 from .exchanges import (
@@ -36,6 +54,665 @@ from .position import Position, PositionSide, PositionStatus
 from .fees import calculate_fee
 from .price_service import get_price_service
 from .activity_log_db import ActivityLogDatabase
+from .scheduler_config import get_scheduler_config
+
+# Optional faster JSON decoder
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import anthropic
+except ImportError:
+    anthropic = None
+
+
+# Precompiled patterns for trader profile parsing (see _parse_trader_profile).
+# Profiles are scanned as raw bytes; only captured groups are decoded to str.
+_TRADER_ID_RE = re.compile(rb'\*\*Trader ID:\*\*\s*`([^`]+)`')
+_TRADER_FIELD_RE = re.compile(
+    rb'- \*\*(Name|Experience Level|Risk Tolerance|Capital Allocation|Primary Style|Holding Period|'
+    rb'Primary Assets|Preferred Pairs|Analysis Timeframe|Entry Timeframe):\*\*\s*(.+)'
+)
+_NEWS_RE = re.compile(rb'- \*\*News Sources:\*\*\s*(.+)')
+_ONCHAIN_RE = re.compile(rb'- \*\*On-chain Data:\*\*\s*(.+)')
+_SOCIAL_RE = re.compile(rb'- \*\*Social Sentiment:\*\*\s*(.+)')
+_LIST_ITEM_RE = re.compile(rb'^-\s+(.+)$', re.MULTILINE)
+_BOLD_RE = re.compile(r'\*\*')
+_NUMBERS_RE = re.compile(r'\d+')
+# ASCII digit runs; a trader ID's number is its last run (as in TraderDatabase.get_max_numeric_id)
+_ID_NUMBER_RE = re.compile(r'[0-9]+')
+
+# Strips CCXT symbol separators in one pass: 'BTC/USDT:USDT' -> 'BTCUSDTUSDT'
+_SYMBOL_TRANS = str.maketrans('', '', '/:-')
+
+# Timeframe phrases normalized to standard codes
+# Note: Removed broad keys like 'minute', 'hour', 'day' to avoid
+# matching '15m' as 'minute' -> '1m' or '4h' as 'hour' -> '1h'
+_TIMEFRAME_MAP = {
+    '1m': '1m', '1 minute': '1m', '1-minute': '1m',
+    '3m': '3m', '3 minutes': '3m', '3-minute': '3m',
+    '5m': '5m', '5 minutes': '5m', '5-minute': '5m',
+    '15m': '15m', '15 minutes': '15m', '15-minute': '15m',
+    '30m': '30m', '30 minutes': '30m', '30-minute': '30m',
+    '1h': '1h', '1 hour': '1h', '1-hour': '1h',
+    '2h': '2h', '2 hours': '2h', '2-hour': '2h',
+    '4h': '4h', '4 hour': '4h', '4-hour': '4h', '4 hours': '4h',
+    '6h': '6h', '6 hours': '6h', '6-hour': '6h',
+    '12h': '12h', '12 hours': '12h', '12-hour': '12h',
+    '1d': '1d', 'daily': '1d',
+    '1w': '1w', 'weekly': '1w',
+    '1M': '1M', 'monthly': '1M',
+}
+
+# Word-boundary patterns sorted by key length (descending) so more specific
+# phrases match first; avoids matching '5m' in '15m' or 'minute' in '15-minute'
+_TIMEFRAME_PATTERNS = [
+    (re.compile(r'\b' + re.escape(key).replace(r'\ ', r'\s+') + r'\b', re.IGNORECASE), code)
+    for key, code in sorted(_TIMEFRAME_MAP.items(), key=lambda kv: len(kv[0]), reverse=True)
+]
+
+
+def _slice_section(content: bytes, header: bytes, terminator: bytes) -> Optional[bytes]:
+    """Return the text between header and the next terminator (or end of content)
+
+    Args:
+        content: Raw markdown content
+        header: Section header including trailing newline
+        terminator: Marker that ends the section (e.g. b'##')
+
+    Returns:
+        Section body, or None if the header is not present
+    """
+    start = content.find(header)
+    if start < 0:
+        return None
+    start += len(header)
+    end = content.find(terminator, start)
+    return content[start:end if end >= 0 else None]
+
+
+def _extract_timeframes(text: str) -> list:
+    """Extract all timeframe codes from text (returns list)"""
+    text_lower = text.lower()
+    found = []
+    for pattern, code in _TIMEFRAME_PATTERNS:
+        if pattern.search(text_lower):
+            if code not in found:
+                found.append(code)
+    return found
+
+
+def _add_timeframes(result: dict, value: str):
+    """Append timeframe codes found in value to result['timeframes']"""
+    for tf in _extract_timeframes(value):
+        if tf not in result['timeframes']:
+            result['timeframes'].append(tf)
+
+
+def _set_style(result: dict, value: str):
+    """Store the primary style as a snake_case code"""
+    result['style'] = value.lower().replace(' ', '_')
+
+
+def _set_trading_pairs(result: dict, value: str):
+    """Replace result['trading_pairs'] with the comma-separated pairs in value"""
+    result['trading_pairs'] = [pair.strip() for pair in value.split(',')]
+
+
+def _extend_trading_pairs(result: dict, value: str):
+    """Append the comma-separated pairs in value to result['trading_pairs']"""
+    result['trading_pairs'].extend(pair.strip() for pair in value.split(','))
+
+
+# Profile fields matched by _TRADER_FIELD_RE that are stored as-is in
+# result['characteristics'], keyed by characteristic name
+_CHARACTERISTIC_FIELDS = {
+    'Name': 'name',
+    'Experience Level': 'experience_level',
+    'Risk Tolerance': 'risk_tolerance',
+    'Capital Allocation': 'capital_allocation',
+    'Holding Period': 'holding_period',
+}
+
+# Handlers for the remaining profile fields, applied in this order
+_FIELD_HANDLERS = {
+    # Trading Style
+    'Primary Style': _set_style,
+    # Trading Instruments
+    'Primary Assets': _set_trading_pairs,
+    'Preferred Pairs': _extend_trading_pairs,
+    # Timeframes (e.g. "Daily and 4-hour charts")
+    'Analysis Timeframe': _add_timeframes,
+    'Entry Timeframe': _add_timeframes,
+}
+
+
+def _parse_trader_profile(trader_file: Path) -> dict:
+    """Extract metadata from a trader markdown file
+
+    Args:
+        trader_file: Path to the trader markdown file
+
+    Returns:
+        Dictionary with extracted metadata including:
+        - characteristics, style, strategy, trading_pairs, timeframes,
+          indicators, information_sources, and metadata
+    """
+    result = {
+        'characteristics': {},
+        'style': '',
+        'strategy': {},
+        'trading_pairs': [],
+        'timeframes': [],
+        'indicators': [],
+        'information_sources': [],
+        'metadata': {'parse_errors': []}
+    }
+
+    try:
+        content = trader_file.read_bytes()
+        if b'\r' in content:
+            # Same newline translation read_text() applied
+            content = content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+        # ExtractTrader ID
+        id_match = _TRADER_ID_RE.search(content)
+        if id_match:
+            result['id'] = id_match.group(1).decode('utf-8')
+        else:
+            # fromFilenameextractnumberID（format：TraderName_123.md）
+            filename = trader_file.stem  # remove.mdsuffix
+            numbers = _NUMBERS_RE.findall(filename)
+            if numbers:
+                # Usenumberpart asID
+                result['id'] = numbers[-1]
+            else:
+                # ifnonumber，UsewholetradersFilename
+                result['id'] = filename
+
+        # Scan all "- **Field:** value" lines in one pass (first occurrence wins)
+        fields = {}
+        for m in _TRADER_FIELD_RE.finditer(content):
+            field = m.group(1).decode('ascii')
+            if field not in fields:
+                fields[field] = m.group(2).decode('utf-8').strip()
+
+        for field, key in _CHARACTERISTIC_FIELDS.items():
+            if field in fields:
+                result['characteristics'][key] = fields[field]
+
+        for field, handler in _FIELD_HANDLERS.items():
+            if field in fields:
+                handler(result, fields[field])
+
+        # Extract Technical Indicators
+        indicators_section = _slice_section(content, b'## Technical Indicators\n', b'##')
+        if indicators_section:
+            # Extract list items from the section
+            indicator_matches = _LIST_ITEM_RE.findall(indicators_section)
+            for indicator in indicator_matches:
+                # Clean up the indicator text (remove ** and other markdown)
+                clean_indicator = _BOLD_RE.sub('', indicator.decode('utf-8')).strip()
+                if clean_indicator:
+                    result['indicators'].append(clean_indicator)
+
+        # Extract Information Sources
+        sources_section = _slice_section(content, b'## Information Sources\n', b'##')
+        if sources_section:
+            # Extract various source types
+            news_match = _NEWS_RE.search(sources_section)
+            if news_match:
+                result['information_sources'].extend(
+                    ['news:' + s.strip() for s in news_match.group(1).decode('utf-8').split(',')]
+                )
+
+            onchain_match = _ONCHAIN_RE.search(sources_section)
+            if onchain_match:
+                result['information_sources'].extend(
+                    ['onchain:' + s.strip() for s in onchain_match.group(1).decode('utf-8').split(',')]
+                )
+
+            social_match = _SOCIAL_RE.search(sources_section)
+            if social_match:
+                result['information_sources'].extend(
+                    ['social:' + s.strip() for s in social_match.group(1).decode('utf-8').split(',')]
+                )
+
+        # Extract Strategy elements
+        entry_section = _slice_section(content, b'### Entry Conditions\n', b'###')
+        if entry_section is not None:
+            result['strategy']['entry_conditions'] = entry_section.decode('utf-8').strip()[:500]
+
+        exit_section = _slice_section(content, b'### Exit Conditions\n', b'###')
+        if exit_section is not None:
+            result['strategy']['exit_conditions'] = exit_section.decode('utf-8').strip()[:500]
+
+        # Clean up lists to remove duplicates (use dict.fromkeys to preserve order)
+        for key in ('trading_pairs', 'timeframes', 'indicators', 'information_sources'):
+            result[key] = list(dict.fromkeys(result[key]))
+
+        # Limit to 1-5 items for focus and specialization
+        # Take first 5 trading pairs (most important ones)
+        if len(result['trading_pairs']) > 5:
+            result['trading_pairs'] = result['trading_pairs'][:5]
+        # Take first 5 timeframes (most important ones) - increased from 3 to 5
+        # to better support multi-timeframe strategies
+        if len(result['timeframes']) > 5:
+            result['timeframes'] = result['timeframes'][:5]
+
+    except Exception as e:
+        result['metadata']['parse_errors'].append(str(e))
+
+    return result
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_trader_file_cached(path_str: str, mtime_ns: int, size: int) -> dict:
+    """Memoized _parse_trader_profile keyed on file identity
+
+    mtime_ns and size are part of the cache key so edits invalidate the entry.
+    """
+    return _parse_trader_profile(Path(path_str))
+
+
+def _maybe_load(value, default):
+    """Decode a JSON-encoded DB field, passing through already-decoded values
+
+    Args:
+        value: JSON string/bytes, decoded object, or None
+        default: Value to return when value is None
+
+    Returns:
+        Decoded object
+    """
+    if value is None:
+        return default
+    if isinstance(value, (str, bytes)):
+        return _json_loads(value)
+    return value
+
+
+@functools.lru_cache(maxsize=64)
+def _parsed_pairs(s: str) -> tuple:
+    """Decode a JSON-encoded trading pairs field, memoized per string
+
+    Args:
+        s: JSON array of trading pair symbols
+
+    Returns:
+        Tuple of trading pair symbols (hashable so it can be cached)
+    """
+    return tuple(_json_loads(s) or ())
+
+
+# Static sections of the decision prompts, hoisted so each /decide call only
+# formats the trader-specific parts
+_PHASE1_TASK = """
+
+YOUR TASK - PHASE 1: SELECT INDICATORS
+
+Based on the trader's strategy and current situation, select which market data indicators you need to make an informed trading decision.
+
+"""
+
+_PHASE1_FOOTER = """
+
+CRITICAL:
+- Use EXACTLY the format shown above with --parameter-name value
+- Each indicator on a NEW line
+- Do NOT use bullet points, dashes, or arrows
+- Do NOT add descriptions or explanations after the indicators
+- Only select the essential indicators for this trader's strategy
+
+Begin your analysis:"""
+
+_PHASE2_TASK = """
+=== YOUR TASK ===
+Make a final trading decision based on:
+1. Trader profile and strategy
+2. Current positions and P&L
+3. Market data analysis
+
+"""
+
+_PHASE2_RESPONSE_FORMAT = """
+
+=== RESPONSE FORMAT ===
+
+Format your response as:
+
+**THINKING:**
+[Your detailed trading analysis here]
+- Analyze market data trends and patterns
+- Evaluate risk vs reward
+- Consider trader's strategy alignment
+- Assess position sizing and timing
+- Explain why this decision is optimal
+
+**ACTION:**
+```python
+# Call one of the trading functions here"""
+
+_PHASE2_FOOTER = """
+
+Begin your analysis and action:"""
+
+
+def _csv_preview(value: str, keep: int = 25) -> str:
+    """Keep the first and last `keep` lines of indicator CSV output
+
+    Locates the cut points by newline offsets instead of splitting the whole
+    output into a list of lines.
+
+    Args:
+        value: Raw CSV text
+        keep: Number of lines to keep at each end
+
+    Returns:
+        Stripped text, with the middle replaced by '...' when it has more
+        than 2 * keep lines
+    """
+    text = value.strip()
+    if text.count('\n') < 2 * keep:
+        return text
+
+    head = -1
+    for _ in range(keep):
+        head = text.find('\n', head + 1)
+    tail = len(text)
+    for _ in range(keep):
+        tail = text.rfind('\n', 0, tail)
+
+    return text[:head] + '\n...\n' + text[tail + 1:]
+
+
+# Indicator requests in phase 1 responses (matched case-insensitively on the raw text).
+# Arguments are captured in a lookahead so a keyword used as an argument is still scanned.
+_NEED_INDICATOR_RE = re.compile(r'^NEED_INDICATOR\s+(\S+)(.*)$', re.MULTILINE | re.IGNORECASE)
+_NEED_RE = re.compile(r'NEED_(ORDERBOOK|MARKET_DATA|MARKET|BOTH)(?=((?:\s+\w+){0,3}))', re.IGNORECASE)
+
+# Phase 1 SELECTED_INDICATORS section and its list-item prefixes
+_SELECTED_INDICATORS_RE = re.compile(r'\*\*SELECTED_INDICATORS:\*\*\s*(.*?)(?=\*\*|\Z)', re.DOTALL | re.IGNORECASE)
+_SELECTED_INDICATORS_ALT_RE = re.compile(r'SELECTED_INDICATORS:\s*(.*?)(?=\*\*|\Z)', re.DOTALL | re.IGNORECASE)
+_BULLET_PREFIX_RE = re.compile(r'^[\-\*\d+\.\)]+\s*')
+
+# Sections of the phase 2 decision response
+_THINKING_RE = re.compile(r'\*\*THINKING:\*\*\s*(.*?)(?=\*\*ACTION:\*\*|$)', re.DOTALL | re.IGNORECASE)
+_THINKING_ALT_RE = re.compile(r'THINKING:\s*(.*?)(?=ACTION:|$)', re.DOTALL | re.IGNORECASE)
+_CODE_BLOCK_RE = re.compile(r'```python\s*(.*?)```', re.DOTALL | re.IGNORECASE)
+_ACTION_SECTION_RE = re.compile(
+    r'\*\*ACTION:\*\*\s*(.*?)(?=\*\*ACTION RESULT:|\*\*THINKING:|$)', re.DOTALL | re.IGNORECASE
+)
+_CODE_FENCE_RE = re.compile(r'```python|```', re.IGNORECASE)
+
+# Action code that only calls hold(), e.g. `result = hold(trader_id="12")`
+_HOLD_CODE_RE = re.compile(
+    r'(?P<assign>result\s*=\s*)?hold\(\s*(?:trader_id\s*=\s*)?'
+    r'(?:trader_id|(?P<quote>["\'])(?P<trader_id>[^"\'\\\n]*)(?P=quote))\s*\)'
+)
+
+# Indicator scripts exposing `async def run(...)`, with the CLI options run() accepts
+_IN_PROCESS_INDICATORS = {
+    'market_data.py': {'exchange': str, 'symbol': str, 'interval': str, 'limit': int},
+    'fetch_orderbook.py': {'exchange': str, 'symbol': str, 'limit': int},
+}
+
+
+def _indicator_kwargs(args: list, accepted: dict) -> Optional[dict]:
+    """Convert indicator CLI arguments into keyword arguments for run()
+
+    Args:
+        args: Command line arguments (e.g. ['--symbol', 'BTCUSDT', '--limit', '20'])
+        accepted: Option name -> converter for the options run() accepts
+
+    Returns:
+        Keyword arguments, or None if the arguments can't be mapped (the script
+        is then run as a subprocess so argparse reports the problem)
+    """
+    if len(args) % 2:
+        return None
+
+    kwargs = {}
+    for option, value in zip(args[::2], args[1::2]):
+        name = option[2:] if option.startswith('--') else None
+        if name not in accepted or value.startswith('--'):
+            return None
+        try:
+            kwargs[name] = accepted[name](value)
+        except ValueError:
+            return None
+
+    if 'exchange' not in kwargs or 'symbol' not in kwargs:
+        return None
+    return kwargs
+
+
+# Worker processes kept warm for indicator scripts that can't run in-process
+_INDICATOR_POOL_WORKERS = 2
+
+# Seconds an indicator script may run, and the extra time the CLI waits for a
+# pool worker to enforce that limit itself before giving up on the worker
+_INDICATOR_TIMEOUT = 60
+_INDICATOR_TIMEOUT_GRACE = 5
+
+
+class _IndicatorTimeout(BaseException):
+    """Raised by the SIGALRM handler to abort an indicator script
+
+    A BaseException so the `except Exception` blocks indicator scripts use
+    for their own error reporting can't swallow it.
+    """
+
+
+def _raise_indicator_timeout(signum, frame):
+    """SIGALRM handler that aborts an indicator script running in a pool worker"""
+    raise _IndicatorTimeout()
+
+
+def _run_indicator_script(script_path: str, args: list, timeout: Optional[float] = None) -> Tuple[int, str, str]:
+    """Run an indicator script as __main__ inside an indicator pool worker
+
+    Mirrors `python script.py args...`: sys.argv is set, stdout/stderr are
+    captured and SystemExit is turned into a return code. Modules the script
+    imports stay loaded in the worker, so only the first run pays for them.
+
+    Args:
+        script_path: Path to the indicator script
+        args: Command line arguments
+        timeout: Seconds after which the script is aborted with a SIGALRM timer,
+            so a hung script frees its worker without touching the others
+            (ignored on platforms without setitimer)
+
+    Returns:
+        Tuple of (return code, stdout, stderr)
+
+    Raises:
+        TimeoutError: If the script ran longer than timeout
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved_argv = sys.argv
+    sys.argv = [script_path] + list(args)
+    returncode = 0
+    saved_handler = None
+    if timeout and hasattr(signal, 'setitimer'):
+        saved_handler = signal.signal(signal.SIGALRM, _raise_indicator_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                runpy.run_path(script_path, run_name='__main__')
+            except SystemExit as e:
+                if e.code is None:
+                    returncode = 0
+                elif isinstance(e.code, int):
+                    returncode = e.code
+                else:
+                    print(e.code, file=sys.stderr)
+                    returncode = 1
+            except Exception:
+                traceback.print_exc()
+                returncode = 1
+    except _IndicatorTimeout:
+        raise TimeoutError("indicator script timed out") from None
+    finally:
+        if saved_handler is not None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, saved_handler)
+        sys.argv = saved_argv
+    return returncode, stdout.getvalue(), stderr.getvalue()
+
+
+# Fields copied from position objects that lack to_dict()
+_POS_KEYS = ('id', 'symbol', 'side', 'size', 'entry_price', 'unrealized_pnl', 'roi')
+_POS_GETTER = operator.attrgetter(*_POS_KEYS)
+
+
+def _iter_output_lines(stream, chunk_size: int = 8192):
+    """Yield decoded lines from a binary subprocess pipe
+
+    Reads whatever is available (up to chunk_size bytes) per call and decodes
+    each chunk once, instead of having a text-mode pipe decode line by line.
+    Newlines are translated like text mode does (CRLF and lone CR become LF).
+
+    Args:
+        stream: Binary pipe (e.g. Popen.stdout opened without text=True)
+        chunk_size: Maximum bytes to read per call
+
+    Yields:
+        Lines including their trailing newline (the last line may lack one)
+    """
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder('utf-8')(errors='replace'), translate=True
+    )
+    # Parts of the current unfinished line, joined once its newline arrives
+    pending = []
+    for chunk in itertools.chain(iter(functools.partial(stream.read1, chunk_size), b''), [None]):
+        text = decoder.decode(b'', final=True) if chunk is None else decoder.decode(chunk)
+        if '\n' not in text:
+            if text:
+                pending.append(text)
+            continue
+        first, *lines, last = text.split('\n')
+        pending.append(first)
+        yield ''.join(pending) + '\n'
+        for line in lines:
+            yield line + '\n'
+        pending = [last] if last else []
+    if pending:
+        yield ''.join(pending)
+
+
+# Cell styles for the positions table, built once instead of re-parsing
+# markup for every row
+_STYLE_POS = Style(color="green")
+_STYLE_NEG = Style(color="red")
+_STYLE_NEUTRAL = Style(color="white")
+_STYLE_OPEN = Style(color="green")
+_STYLE_INACTIVE = Style(color="yellow")
+
+
+def _signed_style(value: float) -> Style:
+    """Pick the table cell style for a signed value
+
+    Args:
+        value: PnL or ROI value
+
+    Returns:
+        Green for positive, red for negative, white for zero
+    """
+    if value > 0:
+        return _STYLE_POS
+    if value < 0:
+        return _STYLE_NEG
+    return _STYLE_NEUTRAL
+
+
+def _format_position_row(pos) -> tuple:
+    """Format a position as a row of the single-trader positions table
+
+    Args:
+        pos: Position object
+
+    Returns:
+        Tuple of cell values (strings and styled Text)
+    """
+    is_open = pos.status is PositionStatus.OPEN
+    pnl = pos.unrealized_pnl if is_open else pos.realized_pnl
+    return (
+        str(pos.id),
+        pos.exchange,
+        pos.symbol,
+        pos.position_side.value,
+        f"{pos.leverage:.1f}x",
+        f"{pos.entry_price:.2f}",
+        f"{pos.position_size:.4f}",
+        f"{pos.margin:.2f}",
+        Text(f"{pnl:+.2f}", style=_signed_style(pnl)),
+        Text(f"{pos.roi:+.2f}%", style=_signed_style(pos.roi)),
+        Text(pos.status.value, style=_STYLE_OPEN if is_open else _STYLE_INACTIVE),
+    )
+
+
+async def _terminate_process(process, grace: float = 5):
+    """Stop an asyncio subprocess if it is still running and reap it
+
+    Sends SIGTERM, then SIGKILL if the process hasn't exited within grace
+    seconds, and always waits for it so no zombie or open pipes are left.
+
+    Args:
+        process: asyncio.subprocess.Process
+        grace: Seconds to wait after each signal
+    """
+    if process.returncode is not None:
+        return
+
+    with contextlib.suppress(ProcessLookupError):
+        process.terminate()
+    try:
+        await asyncio.wait_for(process.wait(), timeout=grace)
+    except asyncio.TimeoutError:
+        with contextlib.suppress(ProcessLookupError):
+            process.kill()
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(process.wait(), timeout=grace)
+
+
+async def _read_stream(stream, chunk_size: int = 65536) -> bytearray:
+    """Drain an asyncio StreamReader into a single growing buffer
+
+    Args:
+        stream: asyncio.StreamReader (e.g. process.stdout)
+        chunk_size: Maximum bytes per read
+
+    Returns:
+        Everything read until EOF
+    """
+    buf = bytearray()
+    while True:
+        chunk = await stream.read(chunk_size)
+        if not chunk:
+            return buf
+        buf += chunk
+
+
+async def _collect_process_output(process) -> Tuple[bytearray, bytearray]:
+    """Read stdout and stderr concurrently as data arrives, then reap
+
+    Args:
+        process: asyncio.subprocess.Process started with both pipes
+
+    Returns:
+        Tuple of (stdout, stderr) buffers
+    """
+    stdout, stderr = await asyncio.gather(
+        _read_stream(process.stdout),
+        _read_stream(process.stderr)
+    )
+    await process.wait()
+    return stdout, stderr
 
 
 def is_interactive_terminal() -> bool:
@@ -47,6 +724,10 @@ def is_interactive_terminal() -> bool:
     return sys.stdout.isatty()
 
 
+# Inputs that exit the main loop
+_QUIT_COMMANDS = frozenset({"/quit", "/exit", "quit", "exit"})
+
+
 class CryptoBot:
     """CryptoBot Main Class
 
@@ -59,6 +740,14 @@ class CryptoBot:
     def __init__(self):
         """Initialize CLI"""
         self.console = Console()
+        # Resolve Claude Code executable once instead of scanning PATH per command
+        self._claude_path = shutil.which("claude")
+        # In-process indicator modules: script name -> (mtime_ns, module)
+        self._indicator_modules = {}
+        # Warm worker processes for other indicator scripts, started on first use
+        self._indicator_pool = None
+        # Anthropic API client, created on first use when ai.backend is 'api'
+        self._anthropic = None
         self.display = KlineDisplay(self.console)
         self.session = PromptSession()
         self._stop_subscription = asyncio.Event()
@@ -75,10 +764,44 @@ class CryptoBot:
         self._ui_running = False
         self._ui_lock = asyncio.Lock()
 
+        # Command dispatch tables for the main loop
+        # Commands that output directly to console
+        self._console_handlers = {
+            "/market": self._handle_rest_command,
+            "/pairs": self._handle_pairs_command,
+            "/intervals": self._handle_intervals_command,
+            "/traders": self._handle_traders_command,
+            "/indicators": self._handle_indicators_command,
+            "/decide": self._handle_decide_command,
+            "/positions": self._handle_positions_command,
+            "/optimize": self._handle_optimize_command,
+            "/config": self._handle_config_command,
+            "/logs": self._handle_logs_command,
+        }
+        # Commands that write to the split UI output panel
+        self._ui_handlers = {
+            "/help": self._handle_help_command,
+            "/start": self._handle_start_command,
+            "/stop": self._handle_stop_command,
+            "/status": self._handle_status_command,
+        }
+
+    def _get_claude_path(self) -> Optional[str]:
+        """Get the cached Claude Code executable path
+
+        Re-resolves from PATH only when the executable was not found before,
+        so installing Claude Code mid-session is picked up on the next command.
+
+        Returns:
+            Path to the claude executable, or None if not installed
+        """
+        if self._claude_path is None:
+            self._claude_path = shutil.which("claude")
+        return self._claude_path
+
     def _print_banner(self):
         """Print welcome banner"""
         # Get default exchange from config
-        from .scheduler_config import get_scheduler_config
         config = get_scheduler_config()
         default_exchange = config.get_string('indicator.exchange', 'okx')
 
@@ -121,7 +844,6 @@ class CryptoBot:
     def _print_help(self):
         """Display help information"""
         # Get default exchange from config
-        from .scheduler_config import get_scheduler_config
         config = get_scheduler_config()
         default_exchange = config.get_string('indicator.exchange', 'okx')
 
@@ -335,6 +1057,9 @@ class CryptoBot:
     trigger.price.enabled             - Enable price trigger
     trigger.price.change_threshold    - Price change threshold
     indicator.limit                   - Indicator data limit
+    ai.backend                        - Decision backend (claude_code or api)
+    ai.model                          - Model for the api backend
+    ai.max_tokens                     - Max response tokens for the api backend
     optimize.enabled                  - Enable auto optimization
     optimize.min_positions            - Min positions before optimization
     optimize.interval_hours           - Optimization interval (hours)
@@ -423,6 +1148,16 @@ class CryptoBot:
             self.pos_db = PositionDatabase()
             self.pos_db.initialize()
 
+    def _close_databases(self):
+        """Close database connections opened by _init_databases"""
+        if self.trader_db:
+            self.trader_db.close()
+            self.trader_db = None
+
+        if self.pos_db:
+            self.pos_db.close()
+            self.pos_db = None
+
     def _init_dashboard(self):
         """Initialize dashboard if not already initialized"""
         from .scheduler_dashboard import SchedulerDashboard
@@ -523,7 +1258,6 @@ class CryptoBot:
             args: Command arguments
         """
         # Get default exchange from config
-        from .scheduler_config import get_scheduler_config
         config = get_scheduler_config()
         default_exchange = config.get_string('indicator.exchange', 'okx')
 
@@ -558,7 +1292,12 @@ class CryptoBot:
             interval: K-line interval
             limit: Number of records to fetch
         """
-        self.console.print(
+        # When output is piped, stdout carries only the JSON lines; status
+        # and error messages go to stderr
+        interactive = is_interactive_terminal()
+        console = self.console if interactive else Console(stderr=True)
+
+        console.print(
             f"[cyan]Fetching {exchange.upper()} {symbol} {interval} perpetual futures data (limit={limit})...[/cyan]"
         )
 
@@ -567,10 +1306,15 @@ class CryptoBot:
             klines = await fetch_klines_ccxt(exchange, symbol, interval, limit)
 
             if not klines:
-                self.console.print("[yellow]No data retrieved[/yellow]")
+                console.print("[yellow]No data retrieved[/yellow]")
                 return
 
-            self.console.print(f"[green]Successfully retrieved {len(klines)} K-line records[/green]\n")
+            console.print(f"[green]Successfully retrieved {len(klines)} K-line records[/green]\n")
+
+            # Skip chart rendering when output is piped (not a terminal)
+            if not interactive:
+                self._print_klines_plain(klines)
+                return
 
             # Clear history and add new data
             self.display.clear_history()
@@ -578,12 +1322,7 @@ class CryptoBot:
                 self.display.update_kline(kline)
 
             # Show static chart
-            chart = self.display._create_kline_chart()
-            table = self.display._create_kline_table()
-            panel = self.display._create_status_panel(symbol, exchange, interval)
-
-            from rich.console import Group as RichGroup
-            self.console.print(RichGroup(panel, chart, table))
+            self.console.print(self.display.generate_renderable(symbol, exchange, interval))
 
             # Show statistics
             if klines:
@@ -604,11 +1343,20 @@ class CryptoBot:
                 )
 
         except ValueError as e:
-            self.console.print(f"[red]Error: {e}[/red]")
+            console.print(f"[red]Error: {e}[/red]")
         except Exception as e:
-            self.console.print(f"[red]Error: {e}[/red]")
-            import traceback
-            self.console.print(f"[dim]{traceback.format_exc()}[/dim]")
+            console.print(f"[red]Error: {e}[/red]")
+            console.print(f"[dim]{traceback.format_exc()}[/dim]")
+
+    def _print_klines_plain(self, klines: list):
+        """Print K-line data as plain JSON lines (non-interactive output)
+
+        Args:
+            klines: K-line data list
+        """
+        for kline in klines:
+            sys.stdout.write(json.dumps(kline) + "\n")
+        sys.stdout.flush()
 
     async def _handle_pairs_command(self, args: list):
         """Handle /pairs command
@@ -617,7 +1365,6 @@ class CryptoBot:
             args: Command arguments
         """
         # Get default exchange from config
-        from .scheduler_config import get_scheduler_config
         config = get_scheduler_config()
         default_exchange = config.get_string('indicator.exchange', 'okx')
 
@@ -754,10 +1501,6 @@ class CryptoBot:
                 self.console.print("[dim]Use /traders -a command to create new trader profile[/dim]")
                 return
 
-            # Display traders in a table
-            from rich.table import Table
-            from rich.panel import Panel
-
             # Create main table
             table = Table(title=f"[bold cyan]Trader Profile List[/bold cyan] (Total {len(traders)} traders)", show_header=True, header_style="bold magenta")
             table.add_column("ID", style="cyan", width=10)
@@ -814,7 +1557,6 @@ class CryptoBot:
             # Style distribution
             by_style = stats.get('by_style', {})
             if by_style:
-                from rich.text import Text
                 stats_text = Text()
                 for style, count in by_style.items():
                     stats_text.append(f"  • {style.replace('_', ' ').title()}: ", style="white")
@@ -832,7 +1574,6 @@ class CryptoBot:
 
         except Exception as e:
             self.console.print(f"[red]Error: {e}[/red]")
-            import traceback
             self.console.print(f"[dim]{traceback.format_exc()}[/dim]")
         finally:
             db.close()
@@ -844,8 +1585,6 @@ class CryptoBot:
             db: TraderDatabase instance
             trader_id:Trader ID
         """
-        import os
-
         # Get trader info first
         trader = db.get_trader(trader_id)
 
@@ -869,7 +1608,6 @@ class CryptoBot:
         self.console.print(f"  [dim]File:[/dim] {trader_file}\n")
 
         # Parse the trader file
-        from pathlib import Path
         trader_data = self._parse_trader_file(Path(trader_file))
 
         # Extract updateable fields
@@ -910,7 +1648,6 @@ class CryptoBot:
 
         except Exception as e:
             self.console.print(f"[red]Error: {e}[/red]")
-            import traceback
             self.console.print(f"[dim]{traceback.format_exc()}[/dim]")
 
     def _delete_trader(self, db, trader_id: str):
@@ -920,8 +1657,6 @@ class CryptoBot:
             db: TraderDatabase instance
             trader_id:Trader ID
         """
-        import os
-
         # Get trader info first
         trader = db.get_trader(trader_id)
 
@@ -995,7 +1730,6 @@ class CryptoBot:
             return
 
         # displaypendingdelete oftraderList
-        from rich.table import Table
         table = Table(title=f"[bold yellow]about todelete {len(valid_traders)} traderstrader[/bold yellow]", show_header=True, header_style="bold magenta")
         table.add_column("ID", style="cyan", width=10)
         table.add_column("Name", style="green", width=20)
@@ -1018,7 +1752,6 @@ class CryptoBot:
             return
 
         # Batch delete
-        import os
         success_count = 0
         failed_count = 0
 
@@ -1083,10 +1816,6 @@ class CryptoBot:
             except:
                 pass
 
-        # Display trader info
-        from rich.panel import Panel
-        from rich.text import Text
-
         # Title
         title_text = Text()
         title_text.append(f"Trader Details: {name} ", style="bold cyan")
@@ -1136,9 +1865,6 @@ class CryptoBot:
             trader_id:Trader ID
             prompt: modifyhintword
         """
-        import os
-        import subprocess
-
         # Get trader info first
         trader = db.get_trader(trader_id)
 
@@ -1173,7 +1899,7 @@ class CryptoBot:
             return
 
         # Find Claude Code executable
-        claude_path = shutil.which("claude")
+        claude_path = self._get_claude_path()
         if not claude_path:
             self.console.print(
                 "[red]Error: Claude Code executable not found[/red]"
@@ -1267,7 +1993,6 @@ Edit the profile.md file now."""
             self.console.print("[red]Error: Claude Code Execution timeout (5minutes)[/red]")
         except Exception as e:
             self.console.print(f"[red]Error: {e}[/red]")
-            import traceback
             self.console.print(f"[dim]{traceback.format_exc()}[/dim]")
 
     async def _fetch_and_display_pairs(self, exchange: str):
@@ -1287,7 +2012,6 @@ Edit the profile.md file now."""
                 return
 
             # Sync pairs to database
-            from cryptobot.trader_db import TraderDatabase
             db = TraderDatabase()
             db.initialize()
             synced_count = db.sync_pairs_from_exchange(exchange, markets)
@@ -1298,10 +2022,10 @@ Edit the profile.md file now."""
             usdt_pairs = []
             for market in markets:
                 symbol = market['symbol']
-                # onlydisplayactive of USDT contract
-                if market.get('active', True) and 'USDT' in symbol.upper():
+                # onlydisplayactive of USDT contract (CCXT symbols are uppercase)
+                if market.get('active', True) and 'USDT' in symbol:
                     # standardized symbol display（remove CCXT specialformat）
-                    display_symbol = symbol.replace('/', '').replace(':', '').replace('-', '')
+                    display_symbol = symbol.translate(_SYMBOL_TRANS)
                     usdt_pairs.append({
                         'symbol': display_symbol,
                         'ccxt_symbol': symbol,
@@ -1313,7 +2037,6 @@ Edit the profile.md file now."""
             self.console.print(f"\n[green]{exchange.upper()} supports of USDT perpetual futures (Total {len(usdt_pairs)} traders):[/green]\n")
 
             # Use Rich tabledisplay
-            from rich.table import Table
 
             table = Table(show_header=True, header_style="bold cyan")
             table.add_column("rank", style="dim", width=6)
@@ -1360,14 +2083,10 @@ Edit the profile.md file now."""
             self.console.print(f"[red]Error: {e}[/red]")
         except Exception as e:
             self.console.print(f"[red]Error: {e}[/red]")
-            import traceback
             self.console.print(f"[dim]{traceback.format_exc()}[/dim]")
 
     def _display_supported_intervals(self):
         """displaysupports of KlineTimeframe"""
-        from cryptobot.trader_db import TraderDatabase
-        from rich.table import Table
-
         # Read intervals from database
         db = TraderDatabase()
         db.initialize()
@@ -1399,202 +2118,24 @@ Edit the profile.md file now."""
     def _parse_trader_file(self, trader_file: Path) -> dict:
         """Extract metadata from a trader markdown file
 
+        Results are cached on (path, mtime, size), so unchanged files are
+        only parsed once.
+
         Args:
             trader_file: Path to the trader markdown file
 
         Returns:
-            Dictionary with extracted metadata including:
-            - characteristics, style, strategy, trading_pairs, timeframes,
-              indicators, information_sources, and metadata
+            Dictionary with extracted metadata (see _parse_trader_profile)
         """
-        import re
-
-        result = {
-            'characteristics': {},
-            'style': '',
-            'strategy': {},
-            'trading_pairs': [],
-            'timeframes': [],
-            'indicators': [],
-            'information_sources': [],
-            'metadata': {'parse_errors': []}
-        }
-
         try:
-            content = trader_file.read_text(encoding='utf-8')
-
-            # ExtractTrader ID
-            id_match = re.search(r'\*\*Trader ID:\*\*\s*`([^`]+)`', content)
-            if id_match:
-                result['id'] = id_match.group(1)
-            else:
-                # fromFilenameextractnumberID（format：TraderName_123.md）
-                import re
-                filename = trader_file.stem  # remove.mdsuffix
-                numbers = re.findall(r'\d+', filename)
-                if numbers:
-                    # Usenumberpart asID
-                    result['id'] = numbers[-1]
-                else:
-                    # ifnonumber，UsewholetradersFilename
-                    result['id'] = filename
-
-            # Extract Identity section
-            name_match = re.search(r'- \*\*Name:\*\*\s*(.+)', content)
-            if name_match:
-                result['characteristics']['name'] = name_match.group(1).strip()
-
-            experience_match = re.search(r'- \*\*Experience Level:\*\*\s*(.+)', content)
-            if experience_match:
-                result['characteristics']['experience_level'] = experience_match.group(1).strip()
-
-            # Extract Characteristics
-            risk_match = re.search(r'- \*\*Risk Tolerance:\*\*\s*(.+)', content)
-            if risk_match:
-                result['characteristics']['risk_tolerance'] = risk_match.group(1).strip()
-
-            capital_match = re.search(r'- \*\*Capital Allocation:\*\*\s*(.+)', content)
-            if capital_match:
-                result['characteristics']['capital_allocation'] = capital_match.group(1).strip()
-
-            # Extract Trading Style
-            style_match = re.search(r'- \*\*Primary Style:\*\*\s*(.+)', content)
-            if style_match:
-                result['style'] = style_match.group(1).strip().lower().replace(' ', '_')
-
-            holding_match = re.search(r'- \*\*Holding Period:\*\*\s*(.+)', content)
-            if holding_match:
-                result['characteristics']['holding_period'] = holding_match.group(1).strip()
-
-            # Extract Trading Instruments (Primary Assets)
-            assets_match = re.search(r'- \*\*Primary Assets:\*\*\s*(.+)', content)
-            if assets_match:
-                assets_str = assets_match.group(1).strip()
-                result['trading_pairs'] = [a.strip() for a in assets_str.split(',')]
-
-            pairs_match = re.search(r'- \*\*Preferred Pairs:\*\*\s*(.+)', content)
-            if pairs_match:
-                pairs_str = pairs_match.group(1).strip()
-                result['trading_pairs'].extend([p.strip() for p in pairs_str.split(',')])
-
-            # Extract Timeframes and normalize to standard codes
-            # Note: Removed broad keys like 'minute', 'hour', 'day' to avoid
-            # matching '15m' as 'minute' -> '1m' or '4h' as 'hour' -> '1h'
-            timeframe_map = {
-                '1m': '1m', '1 minute': '1m', '1-minute': '1m',
-                '3m': '3m', '3 minutes': '3m', '3-minute': '3m',
-                '5m': '5m', '5 minutes': '5m', '5-minute': '5m',
-                '15m': '15m', '15 minutes': '15m', '15-minute': '15m',
-                '30m': '30m', '30 minutes': '30m', '30-minute': '30m',
-                '1h': '1h', '1 hour': '1h', '1-hour': '1h',
-                '2h': '2h', '2 hours': '2h', '2-hour': '2h',
-                '4h': '4h', '4 hour': '4h', '4-hour': '4h', '4 hours': '4h',
-                '6h': '6h', '6 hours': '6h', '6-hour': '6h',
-                '12h': '12h', '12 hours': '12h', '12-hour': '12h',
-                '1d': '1d', 'daily': '1d',
-                '1w': '1w', 'weekly': '1w',
-                '1M': '1M', 'monthly': '1M',
-            }
+            stat = os.stat(trader_file)
+        except OSError:
+            # Let the parser record the error in metadata
+            return _parse_trader_profile(trader_file)
 
-            def extract_timeframes(text):
-                """Extract all timeframe codes from text (returns list)"""
-                import re
-                text_lower = text.lower()
-                found = []
-                # Sort keys by length (descending) to match more specific patterns first
-                sorted_keys = sorted(timeframe_map.keys(), key=len, reverse=True)
-
-                # Find all matching timeframes using word boundary matching
-                # to avoid matching '5m' in '15m' or 'minute' in '15-minute'
-                for key in sorted_keys:
-                    # Create pattern with word boundaries
-                    # Replace spaces with \s+ to handle variations
-                    pattern = r'\b' + re.escape(key).replace(r'\ ', r'\s+') + r'\b'
-                    if re.search(pattern, text_lower, re.IGNORECASE):
-                        code = timeframe_map[key]
-                        if code not in found:
-                            found.append(code)
-                return found
-
-            analysis_tf_match = re.search(r'- \*\*Analysis Timeframe:\*\*\s*(.+)', content)
-            if analysis_tf_match:
-                tf_text = analysis_tf_match.group(1).strip()
-                # Extract timeframes from text like "Daily and 4-hour charts"
-                timeframes = extract_timeframes(tf_text)
-                for tf in timeframes:
-                    if tf not in result['timeframes']:
-                        result['timeframes'].append(tf)
-
-            entry_tf_match = re.search(r'- \*\*Entry Timeframe:\*\*\s*(.+)', content)
-            if entry_tf_match:
-                tf_text = entry_tf_match.group(1).strip()
-                # Extract all timeframes from entry timeframe line
-                timeframes = extract_timeframes(tf_text)
-                for tf in timeframes:
-                    if tf not in result['timeframes']:
-                        result['timeframes'].append(tf)
-
-            # Extract Technical Indicators
-            indicators_section = re.search(r'## Technical Indicators\n(.*?)##', content, re.DOTALL)
-            if indicators_section:
-                # Extract list items from the section
-                indicator_matches = re.findall(r'^-\s+(.+)$', indicators_section.group(1), re.MULTILINE)
-                for indicator in indicator_matches:
-                    # Clean up the indicator text (remove ** and other markdown)
-                    clean_indicator = re.sub(r'\*\*', '', indicator).strip()
-                    if clean_indicator:
-                        result['indicators'].append(clean_indicator)
-
-            # Extract Information Sources
-            sources_section = re.search(r'## Information Sources\n(.*?)##', content, re.DOTALL)
-            if sources_section:
-                # Extract various source types
-                news_match = re.search(r'- \*\*News Sources:\*\*\s*(.+)', sources_section.group(1))
-                if news_match:
-                    result['information_sources'].extend(
-                        ['news:' + s.strip() for s in news_match.group(1).split(',')]
-                    )
-
-                onchain_match = re.search(r'- \*\*On-chain Data:\*\*\s*(.+)', sources_section.group(1))
-                if onchain_match:
-                    result['information_sources'].extend(
-                        ['onchain:' + s.strip() for s in onchain_match.group(1).split(',')]
-                    )
-
-                social_match = re.search(r'- \*\*Social Sentiment:\*\*\s*(.+)', sources_section.group(1))
-                if social_match:
-                    result['information_sources'].extend(
-                        ['social:' + s.strip() for s in social_match.group(1).split(',')]
-                    )
-
-            # Extract Strategy elements
-            entry_section = re.search(r'### Entry Conditions\n(.*?)###', content, re.DOTALL)
-            if entry_section:
-                result['strategy']['entry_conditions'] = entry_section.group(1).strip()[:500]
-
-            exit_section = re.search(r'### Exit Conditions\n(.*?)###', content, re.DOTALL)
-            if exit_section:
-                result['strategy']['exit_conditions'] = exit_section.group(1).strip()[:500]
-
-            # Clean up lists to remove duplicates (use dict.fromkeys to preserve order)
-            result['trading_pairs'] = list(dict.fromkeys(result['trading_pairs']))
-            result['timeframes'] = list(dict.fromkeys(result['timeframes']))
-            result['indicators'] = list(dict.fromkeys(result['indicators']))
-            result['information_sources'] = list(dict.fromkeys(result['information_sources']))
-
-            # Limit to 1-5 items for focus and specialization
-            # Take first 5 trading pairs (most important ones)
-            if len(result['trading_pairs']) > 5:
-                result['trading_pairs'] = result['trading_pairs'][:5]
-            # Take first 5 timeframes (most important ones) - increased from 3 to 5
-            # to better support multi-timeframe strategies
-            if len(result['timeframes']) > 5:
-                result['timeframes'] = result['timeframes'][:5]
-
-        except Exception as e:
-            result['metadata']['parse_errors'].append(str(e))
-
-        return result
+        cached = _parse_trader_file_cached(str(trader_file), stat.st_mtime_ns, stat.st_size)
+        # Callers mutate the returned lists/dicts, so hand out a private copy
+        return copy.deepcopy(cached)
 
     async def _fetch_top_trading_pairs(self, exchange: str = "binance", limit: int = 100) -> list:
         """fetchmainstreamperpetual futuresTrading PairsList
@@ -1613,15 +2154,13 @@ Edit the profile.md file now."""
             if not markets:
                 return []
 
-            # Filter and extract USDT perpetual futures
-            pairs = []
-            for market in markets:
-                symbol = market['symbol']
-                # onlyreturnactive of USDT perpetual futures
-                if market.get('active', True) and 'USDT' in symbol.upper():
-                    # standardizedformat（remove CCXT specialcharacter）
-                    normalized = symbol.replace('/', '').replace(':', '').replace('-', '')
-                    pairs.append(normalized)
+            # Filter and extract active USDT perpetual futures (CCXT symbols are uppercase),
+            # standardizedformat（remove CCXT specialcharacter）
+            pairs = [
+                market['symbol'].translate(_SYMBOL_TRANS)
+                for market in markets
+                if market.get('active', True) and 'USDT' in market['symbol']
+            ]
 
             return pairs[:limit]
 
@@ -1631,6 +2170,22 @@ Edit the profile.md file now."""
 
         return []
 
+    def _scan_trader_folders(self, traders_dir: Path) -> set:
+        """Collect names of trader folders that contain a profile.md
+
+        Args:
+            traders_dir: traders directory
+
+        Returns:
+            Set of folder names
+        """
+        with os.scandir(traders_dir) as it:
+            return {
+                entry.name for entry in it
+                if entry.is_dir(follow_symlinks=False)
+                and os.path.isfile(os.path.join(entry.path, "profile.md"))
+            }
+
     def _get_next_trader_id(self, db) -> int:
         """fetchnexttraderstradernumberID
 
@@ -1641,29 +2196,36 @@ Edit the profile.md file now."""
             nexttradersavailable ofnumberID
         """
         try:
-            # fetchalltraderID
-            traders = db.list_traders()
+            return db.get_max_numeric_id() + 1
 
-            # extractallnumberID
-            numeric_ids = []
-            for trader in traders:
-                trader_id = trader.get('id', '')
-                # trytryfromFilenameorIDinextractnumberpart
-                # supportsformat：TraderName_123.md or 123.md oronlyis 123
-                import re
-                numbers = re.findall(r'\d+', trader_id)
-                if numbers:
-                    numeric_ids.append(int(numbers[-1]))  # take lasttradersnumber
-
-            # returnmostlargeID + 1，ifnothenreturn1
-            if numeric_ids:
-                return max(numeric_ids) + 1
-            else:
-                return 1
+        except Exception:
+            # Fall back to scanning all trader IDs in Python
+            try:
+                traders = db.list_traders()
+
+                # extractallnumberID
+                numeric_ids = []
+                for trader in traders:
+                    trader_id = trader.get('id', '')
+                    # trytryfromFilenameorIDinextractnumberpart
+                    # supportsformat：TraderName_123 or onlyis 123
+                    tail = trader_id.rpartition('_')[2]
+                    if tail.isascii() and tail.isdecimal():
+                        numeric_ids.append(int(tail))
+                    else:
+                        numbers = _ID_NUMBER_RE.findall(trader_id)
+                        if numbers:
+                            numeric_ids.append(int(numbers[-1]))  # take lasttradersnumber
 
-        except Exception as e:
-            self.console.print(f"[yellow]fetchIDfailed，Usedefault value: {e}[/yellow]")
-            return 1
+                # returnmostlargeID + 1，ifnothenreturn1
+                if numeric_ids:
+                    return max(numeric_ids) + 1
+                else:
+                    return 1
+
+            except Exception as e:
+                self.console.print(f"[yellow]fetchIDfailed，Usedefault value: {e}[/yellow]")
+                return 1
 
     async def _handle_newtrader_command(self, args: list):
         """Handle the /newtrader command
@@ -1707,7 +2269,7 @@ Edit the profile.md file now."""
             return
 
         # Find Claude Code executable
-        claude_path = shutil.which("claude")
+        claude_path = self._get_claude_path()
         if not claude_path:
             self.console.print(
                 "[red]Error: Claude Code executable not found[/red]"
@@ -1745,7 +2307,6 @@ Edit the profile.md file now."""
             db.close()
 
             # Get trader constraints from config
-            from .scheduler_config import get_scheduler_config
             config = get_scheduler_config(str(traders_dir.parent / "traders.db"))
             max_pairs = config.get_int('trader.pairs.max', 10)
             max_intervals = config.get_int('trader.intervals.max', 5)
@@ -1843,45 +2404,44 @@ Important:
 
             # Get list of existing trader folders BEFORE running Claude Code
             # Check for subdirectories containing profile.md
-            trader_folders_before = set()
-            for item in traders_dir.iterdir():
-                if item.is_dir() and (item / "profile.md").exists():
-                    trader_folders_before.add(item.name)
-
-            md_files_before = set(f.name for f in traders_dir.glob("*.md") if f.name != "TRADERS.md")
+            trader_folders_before = self._scan_trader_folders(traders_dir)
 
             try:
                 # Run Claude Code as subprocess with real-time output
                 self.console.print("[dim]Claude Code Nowprocessingtask...[/dim]\n")
 
-                # Use Popen for real-time output streaming
-                process = subprocess.Popen(
-                    [claude_path, "--print", instructions],
+                # Async subprocess so the event loop stays responsive while streaming
+                process = await asyncio.create_subprocess_exec(
+                    claude_path, "--print", instructions,
                     cwd=str(traders_dir),
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1  # Line buffered
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT
                 )
 
                 # Stream output in real-time
                 output_lines = []
-                try:
-                    for line in process.stdout:
+
+                async def stream_output():
+                    async for raw in process.stdout:
+                        line = raw.decode(errors='replace')
                         output_lines.append(line)
                         # Show output in dim color to avoid cluttering
                         self.console.print(f"[dim]{line.rstrip()}[/dim]", end="\n")
-                except Exception as e:
-                    process.kill()
-                    raise e
+                    return await process.wait()
 
                 # Wait for process to complete with timeout
                 try:
-                    return_code = process.wait(timeout=300)  # 5 minute timeout
-                except subprocess.TimeoutExpired:
+                    return_code = await asyncio.wait_for(stream_output(), timeout=300)  # 5 minute timeout
+                except asyncio.TimeoutError:
                     process.kill()
+                    await process.wait()
                     self.console.print("[red]Error: Claude Code Execution timeout（5minutes）[/red]")
                     return
+                except Exception:
+                    process.kill()
+                    await process.wait()
+                    raise
 
                 result = type('obj', (object,), {
                     'stdout': ''.join(output_lines),
@@ -1891,10 +2451,7 @@ Important:
 
                 # Get list of trader folders AFTER running Claude Code
                 # Check for subdirectories containing profile.md
-                trader_folders_after = set()
-                for item in traders_dir.iterdir():
-                    if item.is_dir() and (item / "profile.md").exists():
-                        trader_folders_after.add(item.name)
+                trader_folders_after = self._scan_trader_folders(traders_dir)
 
                 # Find new folders
                 new_folders = trader_folders_after - trader_folders_before
@@ -1906,20 +2463,21 @@ Important:
                         self.console.print(f"[dim]Error:\n{result.stderr}[/dim]")
                     return
 
+                # Parse all new trader files concurrently (file reads release the GIL)
+                new_files = [(folder_name, traders_dir / folder_name / "profile.md") for folder_name in new_folders]
+                parsed_files = await asyncio.gather(
+                    *[asyncio.to_thread(self._parse_trader_file, trader_file) for _, trader_file in new_files]
+                )
+
                 # Initialize database
                 db = TraderDatabase()
                 db.initialize()
 
                 new_traders_count = 0
+                trader_records = []
 
                 # Process only new folders
-                for folder_name in new_folders:
-                    trader_folder = traders_dir / folder_name
-                    trader_file = trader_folder / "profile.md"
-
-                    # Parse the trader file
-                    trader_data = self._parse_trader_file(trader_file)
-
+                for (folder_name, trader_file), trader_data in zip(new_files, parsed_files):
                     # Prepare database record
                     trader_record = {
                         'id': trader_data.get('id', folder_name),
@@ -1947,11 +2505,12 @@ Important:
                         )
                         continue
 
-                    # Store original metadata for warning display
-                    original_metadata = trader_record.get('metadata', {}).copy()
+                    trader_records.append(trader_record)
+
+                # Add all new traders to database in one transaction
+                results = db.add_traders_bulk(trader_records) if trader_records else []
 
-                    # Add to database
-                    success = db.add_trader(trader_record)
+                for trader_record, success in zip(trader_records, results):
                     if success:
                         new_traders_count += 1
                         self.console.print(
@@ -1987,7 +2546,6 @@ Important:
 
             except Exception as e:
                 self.console.print(f"[red]Error: {e}[/red]")
-                import traceback
                 self.console.print(f"[dim]{traceback.format_exc()}[/dim]")
 
     async def _handle_newindicator_command(self, args: list):
@@ -2020,7 +2578,7 @@ Important:
             return
 
         # Find Claude Code executable
-        claude_path = shutil.which("claude")
+        claude_path = self._get_claude_path()
         if not claude_path:
             self.console.print(
                 "[red]Error: Claude Code executable not found[/red]"
@@ -2067,16 +2625,15 @@ Only create ONE new indicator script."""
             process = subprocess.Popen(
                 [claude_path, "--print", instructions],
                 cwd=str(indicators_dir),
+                stdin=subprocess.DEVNULL,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1  # Line buffered
+                stderr=subprocess.STDOUT
             )
 
             # Stream output in real-time
             output_lines = []
             try:
-                for line in process.stdout:
+                for line in _iter_output_lines(process.stdout):
                     output_lines.append(line)
                     # Show output in dim color to avoid cluttering
                     self.console.print(f"[dim]{line.rstrip()}[/dim]", end="\n")
@@ -2135,7 +2692,6 @@ Only create ONE new indicator script."""
 
         except Exception as e:
             self.console.print(f"[red]Error: {e}[/red]")
-            import traceback
             self.console.print(f"[dim]{traceback.format_exc()}[/dim]")
 
     async def _handle_indicators_command(self, args: list):
@@ -2146,8 +2702,6 @@ Only create ONE new indicator script."""
         Args:
             args: Command arguments (-a <prompt>) | (filename [-d] [-m <prompt>] [-t <args...>])
         """
-        from rich.table import Table
-        from rich.panel import Panel
         from rich.syntax import Syntax
 
         # Check if INDICATORS.md exists
@@ -2293,7 +2847,7 @@ Only create ONE new indicator script."""
                 return
 
             # Find Claude Code executable
-            claude_path = shutil.which("claude")
+            claude_path = self._get_claude_path()
             if not claude_path:
                 self.console.print(
                     "[red]Error: notfound Claude Code canexecuteFile[/red]"
@@ -2336,16 +2890,15 @@ If test files are created during testing, clean them up after tests pass."""
                 process = subprocess.Popen(
                     [claude_path, "--print", instructions],
                     cwd=str(indicators_dir),
+                    stdin=subprocess.DEVNULL,
                     stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1  # Line buffered
+                    stderr=subprocess.STDOUT
                 )
 
                 # Stream output in real-time
                 output_lines = []
                 try:
-                    for line in process.stdout:
+                    for line in _iter_output_lines(process.stdout):
                         output_lines.append(line)
                         # Show output in dim color to avoid cluttering
                         self.console.print(f"[dim]{line.rstrip()}[/dim]", end="\n")
@@ -2379,7 +2932,6 @@ If test files are created during testing, clean them up after tests pass."""
 
             except Exception as e:
                 self.console.print(f"[red]Error: {e}[/red]")
-                import traceback
                 self.console.print(f"[dim]{traceback.format_exc()}[/dim]")
             return
 
@@ -2469,7 +3021,6 @@ If test files are created during testing, clean them up after tests pass."""
 
                 # Extract argparse parameters
                 params = []
-                import re
                 for line in lines:
                     stripped = line.strip()
                     # Extract add_argument calls
@@ -2513,11 +3064,6 @@ If test files are created during testing, clean them up after tests pass."""
         Args:
             args: Command arguments (trader_id [--wait])
         """
-        import os
-        import json
-        import tempfile
-        from pathlib import Path
-
         if not args:
             self.console.print("[red]Error: Please provide trader_id[/red]")
             return
@@ -2545,11 +3091,6 @@ If test files are created during testing, clean them up after tests pass."""
             verbose: Whether to print verbose output
             trigger_source: What triggered this decision (manual, scheduler, trigger)
         """
-        import os
-        import json
-        import time
-        import tempfile
-        from pathlib import Path
 
         # Initialize activity log database
         log_db = ActivityLogDatabase()
@@ -2580,8 +3121,9 @@ If test files are created during testing, clean them up after tests pass."""
                 self.console.print(f"[Phase 1] Analyzing trader {trader_id} and selecting indicators...")
 
             # Get trader profile
-            with TraderDatabase() as db:
-                trader = db.get_trader(trader_id)
+            self._init_databases()
+            pos_db = self.pos_db
+            trader = self.trader_db.get_trader(trader_id)
 
             # Get trader profile file content
             trader_file = Path(trader['trader_file'])
@@ -2591,17 +3133,16 @@ If test files are created during testing, clean them up after tests pass."""
                 profile_content = "Profile file not found"
 
             # Get position information
-            with PositionDatabase() as pos_db:
-                open_positions = pos_db.list_positions(trader_id, status='open')
-                try:
-                    summary = pos_db.get_trader_positions_summary(trader_id)
-                except Exception:
-                    summary = {
-                        'total_unrealized_pnl': 0,
-                        'total_realized_pnl': 0,
-                        'open_count': len(open_positions),
-                        'average_roi': 0
-                    }
+            open_positions = pos_db.list_positions(trader_id, status='open')
+            try:
+                summary = pos_db.get_trader_positions_summary(trader_id)
+            except Exception:
+                summary = {
+                    'total_unrealized_pnl': 0,
+                    'total_realized_pnl': 0,
+                    'open_count': len(open_positions),
+                    'average_roi': 0
+                }
 
             # Update positions with current prices
             price_service = get_price_service()
@@ -2667,6 +3208,7 @@ If test files are created during testing, clean them up after tests pass."""
                 self.console.print("[Phase 2] Fetching selected market data...")
 
             indicator_data = {}
+            indicator_jobs = []
             for script_name, args in selected_indicators:
                 # Ensure .py extension
                 if not script_name.endswith('.py'):
@@ -2691,7 +3233,6 @@ If test files are created during testing, clean them up after tests pass."""
                         cmd_args.extend([f'--{key}', str(value)])
 
                 # Apply config settings: exchange and limit
-                from .scheduler_config import get_scheduler_config
                 config = get_scheduler_config()
 
                 # Force use configured exchange, override AI's choice
@@ -2710,15 +3251,21 @@ If test files are created during testing, clean them up after tests pass."""
                 if verbose:
                     print(f"[indicator] running {script_name}: {' '.join(cmd_args)}")
 
-                try:
-                    data = await self._run_indicator(script_name, cmd_args)
-                    if data and not data.startswith("error"):
-                        indicator_data[script_name.replace('.py', '')] = data
-                    elif verbose:
-                        self.console.print(f"[Warning] {script_name} failed or returned error")
-                except Exception as e:
+                indicator_jobs.append((script_name, cmd_args))
+
+            # Indicator scripts are independent subprocesses, so run them concurrently
+            outcomes = await asyncio.gather(
+                *[self._run_indicator(script_name, cmd_args) for script_name, cmd_args in indicator_jobs],
+                return_exceptions=True
+            )
+            for (script_name, _), data in zip(indicator_jobs, outcomes):
+                if isinstance(data, Exception):
                     if verbose:
-                        self.console.print(f"[Warning] Error running {script_name}: {e}")
+                        self.console.print(f"[Warning] Error running {script_name}: {data}")
+                elif data and not data.startswith("error"):
+                    indicator_data[script_name.replace('.py', '')] = data
+                elif verbose:
+                    self.console.print(f"[Warning] {script_name} failed or returned error")
 
             if verbose and indicator_data:
                 self.console.print(f"[completed] fetched {len(indicator_data)} indicator(s): {list(indicator_data.keys())}")
@@ -2825,7 +3372,6 @@ If test files are created during testing, clean them up after tests pass."""
 
         except Exception as e:
             self.console.print(f"[Error] decisionprocessError: {e}")
-            import traceback
             if verbose:
                 self.console.print(f"[debug] {traceback.format_exc()}")
 
@@ -2868,27 +3414,27 @@ If test files are created during testing, clean them up after tests pass."""
         action_code = None
 
         # Try to extract THINKING section
-        thinking_match = re.search(r'\*\*THINKING:\*\*\s*(.*?)(?=\*\*ACTION:\*\*|$)', response, re.DOTALL | re.IGNORECASE)
+        thinking_match = _THINKING_RE.search(response)
         if thinking_match:
             thinking = thinking_match.group(1).strip()
         else:
             # Try alternate formats
-            thinking_match = re.search(r'THINKING:\s*(.*?)(?=ACTION:|$)', response, re.DOTALL | re.IGNORECASE)
+            thinking_match = _THINKING_ALT_RE.search(response)
             if thinking_match:
                 thinking = thinking_match.group(1).strip()
 
         # Try to extract ACTION code block
         # Look for ```python code blocks
-        code_match = re.search(r'```python\s*(.*?)```', response, re.DOTALL | re.IGNORECASE)
+        code_match = _CODE_BLOCK_RE.search(response)
         if code_match:
             action_code = code_match.group(1).strip()
         else:
             # Try to find ACTION section without code block
-            action_match = re.search(r'\*\*ACTION:\*\*\s*(.*?)(?=\*\*ACTION RESULT:|\*\*THINKING:|$)', response, re.DOTALL | re.IGNORECASE)
+            action_match = _ACTION_SECTION_RE.search(response)
             if action_match:
                 action_text = action_match.group(1).strip()
                 # Remove ```python or ``` markers if present
-                action_text = re.sub(r'```python|```', '', action_text, flags=re.IGNORECASE).strip()
+                action_text = _CODE_FENCE_RE.sub('', action_text).strip()
                 action_code = action_text
 
         # If still no thinking section, look for content before the action
@@ -2909,15 +3455,13 @@ If test files are created during testing, clean them up after tests pass."""
         Returns:
             List of tuples: [(script_name, {arg_key: arg_value, ...}), ...]
         """
-        import re
-
         if not response:
             return []
 
         # Try to extract SELECTED_INDICATORS section
-        selection_match = re.search(r'\*\*SELECTED_INDICATORS:\*\*\s*(.*?)(?=\*\*|\Z)', response, re.DOTALL | re.IGNORECASE)
+        selection_match = _SELECTED_INDICATORS_RE.search(response)
         if not selection_match:
-            selection_match = re.search(r'SELECTED_INDICATORS:\s*(.*?)(?=\*\*|\Z)', response, re.DOTALL | re.IGNORECASE)
+            selection_match = _SELECTED_INDICATORS_ALT_RE.search(response)
 
         if not selection_match:
             return []
@@ -2934,7 +3478,7 @@ If test files are created during testing, clean them up after tests pass."""
                 continue
 
             # Remove bullet points and numbering
-            line = re.sub(r'^[\-\*\d+\.\)]+\s*', '', line)
+            line = _BULLET_PREFIX_RE.sub('', line)
 
             # Split into parts
             parts = line.split()
@@ -3022,19 +3566,29 @@ If test files are created during testing, clean them up after tests pass."""
             Dict with execution result
         """
         from .trading_tools import TradingTools
-        from .trader_db import TraderDatabase
-        from .position_db import PositionDatabase
-        from .scheduler_config import get_scheduler_config
 
-        # Initialize databases
-        trader_db = TraderDatabase()
-        trader_db.initialize()
-        pos_db = PositionDatabase()
-        pos_db.initialize()
+        # Reuse the CLI-lifetime database connections
+        self._init_databases()
+        trader_db = self.trader_db
+        pos_db = self.pos_db
 
         # Create trading tools instance
         tools = TradingTools(self.console, pos_db, trader_db)
 
+        # HOLD is the most common action; answer a bare hold() call directly
+        # instead of compiling and exec-ing it
+        hold_match = _HOLD_CODE_RE.fullmatch(code)
+        if hold_match:
+            hold_trader_id = hold_match.group('trader_id')
+            hold_result = tools.hold(trader_id if hold_trader_id is None else hold_trader_id)
+            return {
+                'success': True,
+                'code': code,
+                'output': '',
+                'result': hold_result if hold_match.group('assign') else None,
+                'error': None
+            }
+
         # Get configured default exchange to override AI's choice
         config = get_scheduler_config()
         configured_exchange = config.get_string('indicator.exchange', 'okx')
@@ -3058,21 +3612,20 @@ If test files are created during testing, clean them up after tests pass."""
         }
 
         # Capture output
-        import io
-        import sys
         old_stdout = sys.stdout
         sys.stdout = captured_output = io.StringIO()
 
         try:
             # Check if code contains async operations
-            code_stripped = code.strip()
             is_async = 'await' in code or 'async def' in code
 
             if is_async:
-                # Wrap async code in an async function
+                # Wrap async code in an async function, indenting every line
+                # in a single pass over the code
+                body = "    " + code.replace("\n", "\n    ")
                 wrapped_code = f'''
 async def _ai_generated_code():
-{chr(10).join("    " + line for line in code.split(chr(10)))}
+{body}
     return locals()
 '''
                 # Define the async function
@@ -3102,7 +3655,6 @@ async def _ai_generated_code():
             }
 
         except Exception as e:
-            import traceback
             return {
                 'success': False,
                 'code': code,
@@ -3114,8 +3666,6 @@ async def _ai_generated_code():
 
         finally:
             sys.stdout = old_stdout
-            trader_db.close()
-            pos_db.close()
 
     def _build_decision_context(self, trader, open_positions, summary, profile_content):
         """Build decision context dict
@@ -3130,11 +3680,10 @@ async def _ai_generated_code():
             Decision context dictionary
         """
         # Parse trader characteristics
-        import json
-        characteristics = json.loads(trader['characteristics']) if isinstance(trader.get('characteristics'), str) else trader.get('characteristics', {})
-        strategy = json.loads(trader['strategy']) if isinstance(trader.get('strategy'), str) else trader.get('strategy', {})
-        trading_pairs = json.loads(trader['trading_pairs']) if isinstance(trader.get('trading_pairs'), str) else trader.get('trading_pairs', [])
-        timeframes = json.loads(trader['timeframes']) if isinstance(trader.get('timeframes'), str) else trader.get('timeframes', [])
+        characteristics = _maybe_load(trader.get('characteristics'), {})
+        strategy = _maybe_load(trader.get('strategy'), {})
+        trading_pairs = _maybe_load(trader.get('trading_pairs'), [])
+        timeframes = _maybe_load(trader.get('timeframes'), [])
 
         return {
             'trader': {
@@ -3166,7 +3715,10 @@ async def _ai_generated_code():
             return position.to_dict()
         elif isinstance(position, dict):
             return position
-        else:
+
+        try:
+            return dict(zip(_POS_KEYS, _POS_GETTER(position)))
+        except AttributeError:
             return {
                 'id': getattr(position, 'id', None),
                 'symbol': getattr(position, 'symbol', ''),
@@ -3216,11 +3768,16 @@ async def _ai_generated_code():
             indicators_text += f"  Parameters: {', '.join(meta['parameters'])}\n\n"
 
         # Build default parameters for common indicators
-        default_pair = trader['trading_pairs'][0] if trader['trading_pairs'] else 'BTCUSDT'
+        trading_pairs = trader['trading_pairs']
+        if trading_pairs:
+            default_pair = trading_pairs[0]
+            pairs_text = ', '.join(trading_pairs[:5])
+        else:
+            default_pair = 'BTCUSDT'
+            pairs_text = ''
         default_timeframe = trader['timeframes'][0] if trader['timeframes'] else '1h'
 
         # Get default exchange from config
-        from .scheduler_config import get_scheduler_config
         config = get_scheduler_config()
         default_exchange = config.get_string('indicator.exchange', 'okx')
 
@@ -3232,15 +3789,9 @@ TRADER PROFILE:
 TRADER DATA:
 - Balance: ${trader['balance']:.2f}
 - Equity: ${trader['equity']:.2f}
-- Trading pairs: {', '.join(trader['trading_pairs'][:5])}
+- Trading pairs: {pairs_text}
 - Timeframes: {', '.join(trader['timeframes'])}
-{pos_info}
-
-YOUR TASK - PHASE 1: SELECT INDICATORS
-
-Based on the trader's strategy and current situation, select which market data indicators you need to make an informed trading decision.
-
-{indicators_text}
+{pos_info}{_PHASE1_TASK}{indicators_text}
 
 **IMPORTANT:**
 - Default exchange: {default_exchange}
@@ -3259,16 +3810,7 @@ Example (exact format):
 **SELECTED_INDICATORS:**
 market_data.py --exchange {default_exchange} --symbol {default_pair} --interval {default_timeframe}
 fetch_orderbook.py --exchange {default_exchange} --symbol {default_pair} --limit 20
-longshortratio.py --exchange {default_exchange} --symbol {default_pair} --period 5m --limit 100
-
-CRITICAL:
-- Use EXACTLY the format shown above with --parameter-name value
-- Each indicator on a NEW line
-- Do NOT use bullet points, dashes, or arrows
-- Do NOT add descriptions or explanations after the indicators
-- Only select the essential indicators for this trader's strategy
-
-Begin your analysis:"""
+longshortratio.py --exchange {default_exchange} --symbol {default_pair} --period 5m --limit 100{_PHASE1_FOOTER}"""
 
     def _build_phase2_prompt(self, context, indicator_data, phase1_response):
         """Build Phase 2 prompt for final decision
@@ -3281,7 +3823,6 @@ Begin your analysis:"""
         Returns:
             Prompt string for Claude Code
         """
-        from .scheduler_config import get_scheduler_config
 
         trader = context['trader']
         positions = context['positions']
@@ -3307,11 +3848,7 @@ Begin your analysis:"""
             indicator_text = "\n=== MARKET DATA (CSV format) ===\n"
             for key, value in indicator_data.items():
                 # Truncate to max 50 lines to save tokens
-                lines = value.strip().split('\n')
-                if len(lines) > 50:
-                    preview = '\n'.join(lines[:25]) + '\n...\n' + '\n'.join(lines[-25:])
-                else:
-                    preview = value.strip()
+                preview = _csv_preview(value)
                 indicator_text += f"\n{key}:\n{preview}\n"
         else:
             indicator_text = "\nNo additional market data was collected.\n"
@@ -3329,30 +3866,7 @@ Equity: ${trader['equity']:.2f}
 === CONFIGURED DEFAULT EXCHANGE ===
 The default exchange is: {default_exchange}
 IMPORTANT: You MUST use this exchange in your trading decisions unless there's a specific reason to use a different exchange.
-
-=== YOUR TASK ===
-Make a final trading decision based on:
-1. Trader profile and strategy
-2. Current positions and P&L
-3. Market data analysis
-
-{TOOL_DESCRIPTIONS}
-
-=== RESPONSE FORMAT ===
-
-Format your response as:
-
-**THINKING:**
-[Your detailed trading analysis here]
-- Analyze market data trends and patterns
-- Evaluate risk vs reward
-- Consider trader's strategy alignment
-- Assess position sizing and timing
-- Explain why this decision is optimal
-
-**ACTION:**
-```python
-# Call one of the trading functions here
+{_PHASE2_TASK}{TOOL_DESCRIPTIONS}{_PHASE2_RESPONSE_FORMAT}
 # IMPORTANT: Use the configured default exchange: {default_exchange}
 result = await open_position(
     trader_id="{trader['id']}",
@@ -3414,9 +3928,7 @@ result = hold(trader_id="{trader['id']}")
 - Use correct symbol format: BTCUSDT (NOT BTCUSDTUSDT)
 - Leverage defaults to 1x if not specified
 - Available exchanges: binance, okx, bybit, bitget
-- **IMPORTANT**: Use the configured default exchange ({default_exchange}) unless there's a specific reason to use a different exchange
-
-Begin your analysis and action:"""
+- **IMPORTANT**: Use the configured default exchange ({default_exchange}) unless there's a specific reason to use a different exchange{_PHASE2_FOOTER}"""
 
     async def _call_claude_code_for_decision(self, prompt: str, trader_id: str):
         """Call Claude Code subprocess for AI decision
@@ -3428,11 +3940,16 @@ Begin your analysis and action:"""
         Returns:
             Claude Code response string
         """
-        claude_path = shutil.which("claude")
+        config = get_scheduler_config()
+        if config.get_string('ai.backend', 'claude_code') == 'api':
+            return await self._call_anthropic_api(prompt, config)
+
+        claude_path = self._get_claude_path()
         if not claude_path:
             return "ERROR: Claude Code not installed"
 
         # Use stdin to pass the prompt
+        process = None
         try:
             process = await asyncio.create_subprocess_exec(
                 claude_path,
@@ -3454,18 +3971,48 @@ Begin your analysis and action:"""
             return stdout.decode().strip()
 
         except asyncio.TimeoutError:
-            if process:
-                # Try to terminate gracefully first
-                try:
-                    process.terminate()
-                    await asyncio.wait_for(process.wait(), timeout=5)
-                except asyncio.TimeoutError:
-                    # Force kill if terminate doesn't work
-                    process.kill()
-                    await process.wait()
             return "ERROR: Claude Code timeout (5 minutes)"
         except Exception as e:
             return f"ERROR: {str(e)}"
+        finally:
+            # Reap Claude Code on timeout, error or cancellation (e.g. scheduler task timeout)
+            if process is not None:
+                await _terminate_process(process)
+
+    async def _call_anthropic_api(self, prompt: str, config) -> str:
+        """Send a decision prompt through a persistent Anthropic API client
+
+        The client (and its HTTP connection pool) is reused across calls, avoiding
+        a Claude Code process launch per prompt.
+
+        Args:
+            prompt: Prompt string
+            config: Scheduler configuration (ai.model, ai.max_tokens)
+
+        Returns:
+            Response text, or an "ERROR: ..." string
+        """
+        if anthropic is None:
+            return "ERROR: ai.backend is 'api' but the anthropic package is not installed"
+
+        try:
+            if self._anthropic is None:
+                self._anthropic = anthropic.AsyncAnthropic()
+
+            message = await asyncio.wait_for(
+                self._anthropic.messages.create(
+                    model=config.get_string('ai.model', 'claude-sonnet-4-5'),
+                    max_tokens=config.get_int('ai.max_tokens', 4096),
+                    messages=[{"role": "user", "content": prompt}]
+                ),
+                timeout=300  # 5 minutes
+            )
+        except asyncio.TimeoutError:
+            return "ERROR: Anthropic API timeout (5 minutes)"
+        except Exception as e:
+            return f"ERROR: {str(e)}"
+
+        return ''.join(block.text for block in message.content if block.type == 'text').strip()
 
     def _discover_indicators(self) -> dict:
         """Discover all indicator scripts in indicators/ directory
@@ -3480,9 +4027,6 @@ Begin your analysis and action:"""
                 }
             }
         """
-        from pathlib import Path
-        import re
-
         indicators_dir = Path(__file__).parent.parent / "indicators"
         indicators = {}
 
@@ -3589,9 +4133,6 @@ Begin your analysis and action:"""
         Returns:
             True if script has --limit parameter
         """
-        from pathlib import Path
-        import re
-
         indicators_dir = Path(__file__).parent.parent / "indicators"
         script_path = indicators_dir / script_name
 
@@ -3615,34 +4156,30 @@ Begin your analysis and action:"""
         Returns:
             Dictionary of indicator results (CSV strings)
         """
-        import json
-        from pathlib import Path
-
         results = {}
-        response_upper = response.upper()
 
         # Parse trading pairs from trader
-        trading_pairs = json.loads(trader['trading_pairs']) if isinstance(trader.get('trading_pairs'), str) else trader.get('trading_pairs', [])
+        # TraderDatabase.get_trader already returns a list; legacy records may
+        # still carry the raw JSON string
+        trading_pairs = trader.get('trading_pairs') or ()
+        if isinstance(trading_pairs, str):
+            trading_pairs = _parsed_pairs(trading_pairs)
         default_symbol = trading_pairs[0] if trading_pairs else "BTCUSDT"
 
         # Get default exchange from config
-        from .scheduler_config import get_scheduler_config
         config = get_scheduler_config()
         default_exchange = config.get_string('indicator.exchange', 'okx')
 
-        import re
-
         # Check for new dynamic indicator format: NEED_INDICATOR <script_name> [args...]
         # Match each line that starts with NEED_INDICATOR
-        indicator_matches = re.finditer(r'^NEED_INDICATOR\s+(\S+)(.*)$', response_upper, re.MULTILINE)
+        indicator_matches = _NEED_INDICATOR_RE.finditer(response)
 
         # Collect all indicator requests
         indicator_requests = []
         for match in indicator_matches:
-            script_name = match.group(1)
-            args_str = match.group(2).strip()
-            # Parse arguments
-            args_parts = args_str.split() if args_str else []
+            script_name = match.group(1).upper()
+            # Parse arguments (split() already drops surrounding whitespace)
+            args_parts = match.group(2).upper().split()
             indicator_requests.append((script_name, args_parts))
 
         # Debug: Log if indicators were detected
@@ -3652,24 +4189,38 @@ Begin your analysis and action:"""
                 print(f"[DEBUG]   - {script} {' '.join(args)}")
 
         # Also support legacy format for backward compatibility
-        orderbook_match = re.search(r'NEED_ORDERBOOK\s+(\w+)\s+(\w+)', response_upper)
-        market_match = re.search(r'NEED_MARKET_DATA\s+(\w+)\s+(\w+)\s+(\w+)', response_upper)
-        both_match = re.search(r'NEED_BOTH\s+(\w+)\s+(\w+)\s+(\w+)', response_upper)
+        # One scan collects every NEED_* keyword and the first occurrence of each with full arguments
+        need_orderbook = need_market = False
+        orderbook_match = market_match = both_match = None
+        for match in _NEED_RE.finditer(response):
+            kind = match.group(1).upper()
+            words = match.group(2).split()
+            if kind == 'ORDERBOOK':
+                need_orderbook = True
+                if orderbook_match is None and len(words) >= 2:
+                    orderbook_match = words
+            elif kind == 'BOTH':
+                if both_match is None and len(words) >= 3:
+                    both_match = words
+            else:
+                need_market = True
+                if kind == 'MARKET_DATA' and market_match is None and len(words) >= 3:
+                    market_match = words
 
-        if "NEED_ORDERBOOK" in response_upper or both_match:
+        if need_orderbook or both_match:
             if orderbook_match:
-                args_parts = [orderbook_match.group(1).lower(), orderbook_match.group(2).upper()]
+                args_parts = [orderbook_match[0].lower(), orderbook_match[1].upper()]
             elif both_match:
-                args_parts = [both_match.group(1).lower(), both_match.group(2).upper()]
+                args_parts = [both_match[0].lower(), both_match[1].upper()]
             else:
                 args_parts = [default_exchange, default_symbol]
             indicator_requests.append(("fetch_orderbook.py", args_parts))
 
-        if "NEED_MARKET" in response_upper or both_match:
+        if need_market or both_match:
             if market_match:
-                args_parts = [market_match.group(1).lower(), market_match.group(2).upper(), market_match.group(3).lower()]
+                args_parts = [market_match[0].lower(), market_match[1].upper(), market_match[2].lower()]
             elif both_match:
-                args_parts = [both_match.group(1).lower(), both_match.group(2).upper(), both_match.group(3).lower()]
+                args_parts = [both_match[0].lower(), both_match[1].upper(), both_match[2].lower()]
             else:
                 args_parts = [default_exchange, default_symbol, "1h"]
             indicator_requests.append(("market_data.py", args_parts))
@@ -3678,6 +4229,7 @@ Begin your analysis and action:"""
             # Discover available indicators to validate requests
             available_indicators = self._discover_indicators()
 
+            indicator_jobs = []
             for script_name, args_parts in indicator_requests:
                 # Ensure .py extension (case-insensitive check)
                 script_name_lower = script_name.lower()
@@ -3739,12 +4291,20 @@ Begin your analysis and action:"""
                     script_args = [arg for i, arg in enumerate(script_args) if not (arg == '--limit' or (i > 0 and script_args[i-1] == '--limit'))]
                     script_args.extend(["--limit", str(limit_config)])
 
-                # Run the indicator
+                # Queue the indicator
                 indicator_key = script_name.replace('.py', '')
                 print(f"[indicator] running {indicator_key}: {' '.join(script_args)}")
+                indicator_jobs.append((indicator_key, script_name, script_args))
 
-                indicator_data = await self._run_indicator(script_name, script_args)
-                if indicator_data and not indicator_data.startswith("error"):
+            # Run all requested indicators concurrently (e.g. orderbook and market data for NEED_BOTH)
+            outcomes = await asyncio.gather(
+                *[self._run_indicator(script_name, script_args) for _, script_name, script_args in indicator_jobs],
+                return_exceptions=True
+            )
+            for (indicator_key, script_name, _), indicator_data in zip(indicator_jobs, outcomes):
+                if isinstance(indicator_data, Exception):
+                    self.console.print(f"[Warning] Indicator execution exception: {indicator_data}")
+                elif indicator_data and not indicator_data.startswith("error"):
                     results[indicator_key] = indicator_data
                 else:
                     self.console.print(f"[Warning] Indicator {script_name} failed or returned error")
@@ -3754,6 +4314,57 @@ Begin your analysis and action:"""
 
         return results
 
+    def _load_indicator_module(self, script_path: Path):
+        """Import an indicator script as a module, reloading it when the file changes
+
+        Args:
+            script_path: Path to the indicator script
+
+        Returns:
+            Loaded module
+        """
+        mtime_ns = script_path.stat().st_mtime_ns
+        cached = self._indicator_modules.get(script_path.name)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+
+        spec = importlib.util.spec_from_file_location(f"_indicator_{script_path.stem}", script_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        self._indicator_modules[script_path.name] = (mtime_ns, module)
+        return module
+
+    def _get_indicator_pool(self) -> ProcessPoolExecutor:
+        """Get the indicator worker pool, starting it on first use
+
+        Returns:
+            ProcessPoolExecutor with _INDICATOR_POOL_WORKERS spawned workers
+        """
+        if self._indicator_pool is None:
+            self._indicator_pool = ProcessPoolExecutor(
+                max_workers=_INDICATOR_POOL_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._indicator_pool
+
+    def _shutdown_indicator_pool(self, kill: bool = False):
+        """Stop the indicator worker pool
+
+        Args:
+            kill: Terminate the workers instead of letting running scripts finish
+                (used when a worker is broken or ignored its script timeout).
+                Uses ProcessPoolExecutor.terminate_workers(), new in Python 3.14
+                (the minimum set by requires-python in pyproject.toml)
+        """
+        pool, self._indicator_pool = self._indicator_pool, None
+        if pool is None:
+            return
+
+        if kill:
+            pool.terminate_workers()
+        else:
+            pool.shutdown(wait=True, cancel_futures=True)
+
     async def _run_indicator(self, script_name: str, args: list):
         """Run an indicator script and parse CSV output
 
@@ -3764,7 +4375,6 @@ Begin your analysis and action:"""
         Returns:
             CSV data as string or None
         """
-        from pathlib import Path
 
         indicators_dir = Path(__file__).parent.parent / "indicators"
         script_path = indicators_dir / script_name
@@ -3773,40 +4383,89 @@ Begin your analysis and action:"""
             self.console.print(f"[Error] indicatorscriptdoes not exist: {script_path}")
             return None
 
+        # Call built-in indicators directly instead of starting a new interpreter
+        accepted = _IN_PROCESS_INDICATORS.get(script_name)
+        kwargs = _indicator_kwargs(args, accepted) if accepted else None
+        if kwargs is not None:
+            try:
+                run = getattr(self._load_indicator_module(script_path), 'run', None)
+            except Exception:
+                run = None  # Fall back to running the script as a subprocess
+            if run is not None:
+                try:
+                    return await asyncio.wait_for(run(**kwargs), timeout=60)  # 1 minute timeout
+                except asyncio.TimeoutError:
+                    self.console.print(f"[Warning] indicatortimeout: {script_name}")
+                    return None
+                except Exception as e:
+                    self.console.print(f"[Warning] indicatorexecutefailed: {e}")
+                    return None
+
+        # Run other scripts in a warm worker process to skip interpreter startup
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self._get_indicator_pool(), _run_indicator_script,
+                str(script_path), list(args), _INDICATOR_TIMEOUT
+            )
+            returncode, stdout, stderr = await asyncio.wait_for(
+                future, timeout=_INDICATOR_TIMEOUT + _INDICATOR_TIMEOUT_GRACE
+            )
+        except asyncio.TimeoutError:
+            # The worker aborts a hung script itself; only if it failed to do so
+            # does the script still occupy a worker, and the pool is replaced
+            if future.cancelled():
+                self._shutdown_indicator_pool(kill=True)
+            self.console.print(f"[Warning] indicatortimeout: {script_name}")
+            return None
+        except BrokenExecutor:
+            # A worker died (e.g. the script crashed the interpreter); start a
+            # fresh pool next time and run this script as a subprocess
+            self._shutdown_indicator_pool(kill=True)
+        except Exception as e:
+            self.console.print(f"[Warning] indicatorexecutefailed: {e}")
+            return None
+        else:
+            if returncode != 0:
+                self.console.print(f"[Warning] indicatorscriptError: {stderr[:100]}")
+                return None
+            return stdout
+
         cmd = [sys.executable, str(script_path)] + args
 
+        process = None
         try:
+            # Indicator scripts never read stdin; don't hand them the prompt's terminal
             process = await asyncio.create_subprocess_exec(
                 *cmd,
+                stdin=asyncio.subprocess.DEVNULL,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stderr=asyncio.subprocess.PIPE,
+                close_fds=True
             )
 
             stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
+                _collect_process_output(process),
                 timeout=60  # 1 minute timeout
             )
 
             if process.returncode != 0:
-                self.console.print(f"[Warning] indicatorscriptError: {stderr.decode()[:100]}")
+                self.console.print(f"[Warning] indicatorscriptError: {stderr[:100].decode(errors='replace')}")
                 return None
 
+            # Decode straight from the read buffer, without an intermediate bytes copy
             return stdout.decode()
 
         except asyncio.TimeoutError:
-            # Try to terminate the process gracefully first
-            try:
-                process.terminate()
-                await asyncio.wait_for(process.wait(), timeout=5)
-            except asyncio.TimeoutError:
-                # Force kill if terminate doesn't work
-                process.kill()
-                await process.wait()
             self.console.print(f"[Warning] indicatortimeout: {script_name}")
             return None
         except Exception as e:
             self.console.print(f"[Warning] indicatorexecutefailed: {e}")
             return None
+        finally:
+            # Reap the script on timeout, error or cancellation
+            if process is not None:
+                await _terminate_process(process)
 
     async def _show_trader_positions(self, trader_id: str):
         """Display trader's positions with updated PnL
@@ -3814,22 +4473,17 @@ Begin your analysis and action:"""
         Args:
             trader_id:Trader ID
         """
-        from .position_db import PositionDatabase
+        self._init_databases()
+        trader_db = self.trader_db
+        pos_db = self.pos_db
 
         # Verify trader exists
-        trader_db = TraderDatabase()
-        trader_db.initialize()
         trader = trader_db.get_trader(trader_id)
-        trader_db.close()
 
         if not trader:
             self.console.print(f"[yellow]Trader with ID '{trader_id}' not found[/yellow]")
             return
 
-        # Initialize position database
-        pos_db = PositionDatabase()
-        pos_db.initialize()
-
         try:
             # Fetch current prices and update all positions
             self.console.print(f"[cyan]Nowfetch {trader_id} positionsinformation...[/cyan]")
@@ -3837,15 +4491,14 @@ Begin your analysis and action:"""
             price_service = get_price_service()
             updated_positions = await price_service.update_trader_positions(trader_id, pos_db)
 
-            # Get all positions
-            all_positions = pos_db.list_positions(trader_id)
+            # Get all positions, sorted by PnL, along with their summary
+            sorted_positions, summary = pos_db.list_positions_sorted_with_summary(trader_id)
 
-            if not all_positions:
+            if not sorted_positions:
                 self.console.print(f"[yellow]trader {trader_id} temporarilyNoposition[/yellow]")
                 return
 
             # Display positions table
-            from rich.table import Table
 
             table = Table(
                 title=f"[bold cyan]trader {trader_id} positions[/bold cyan]",
@@ -3864,48 +4517,15 @@ Begin your analysis and action:"""
             table.add_column("ROI %", style="white", width=10)
             table.add_column("status", style="white", width=10)
 
-            # Sort by unrealized_pnl DESC (most profitable first)
-            sorted_positions = sorted(
-                all_positions,
-                key=lambda p: p.unrealized_pnl if p.status == PositionStatus.OPEN else p.realized_pnl,
-                reverse=True
-            )
-
-            for pos in sorted_positions:
-                # Format PnL with color
-                pnl = pos.unrealized_pnl if pos.status == PositionStatus.OPEN else pos.realized_pnl
-                pnl_color = "green" if pnl > 0 else "red" if pnl < 0 else "white"
-                pnl_str = f"[{pnl_color}]{pnl:+.2f}[/{pnl_color}]"
-
-                # Format ROI with color
-                roi_color = "green" if pos.roi > 0 else "red" if pos.roi < 0 else "white"
-                roi_str = f"[{roi_color}]{pos.roi:+.2f}%[/{roi_color}]"
-
-                # Format status
-                status_str = pos.status.value
-                status_color = "green" if pos.status == PositionStatus.OPEN else "yellow"
-
-                table.add_row(
-                    str(pos.id),
-                    pos.exchange,
-                    pos.symbol,
-                    pos.position_side.value,
-                    f"{pos.leverage:.1f}x",
-                    f"{pos.entry_price:.2f}",
-                    f"{pos.position_size:.4f}",
-                    f"{pos.margin:.2f}",
-                    pnl_str,
-                    roi_str,
-                    f"[{status_color}]{status_str}[/{status_color}]"
-                )
+            # Format every row first, then add them in one tight loop
+            rows = [_format_position_row(pos) for pos in sorted_positions]
+            add_row = table.add_row
+            for row in rows:
+                add_row(*row)
 
             self.console.print(table)
 
             # Display summary
-            summary = pos_db.get_trader_positions_summary(trader_id)
-
-            from rich.panel import Panel
-            from rich.text import Text
 
             summary_text = Text()
             summary_text.append(f"Total positions: {summary['total_positions']}\n", style="white")
@@ -3932,17 +4552,11 @@ Begin your analysis and action:"""
             self.console.print("\n", panel)
 
             # Update trader equity with current unrealized PnL
-            trader_db = TraderDatabase()
-            trader_db.initialize()
             trader_db.update_equity_with_unrealized_pnl(trader_id, summary['total_unrealized_pnl'])
-            trader_db.close()
 
         except Exception as e:
             self.console.print(f"[red]Error: {e}[/red]")
-            import traceback
             self.console.print(f"[dim]{traceback.format_exc()}[/dim]")
-        finally:
-            pos_db.close()
 
     async def _handle_openposition_command(self, args: list):
         """Handle opening a new position (called from /positions command with -o flag)
@@ -3992,23 +4606,36 @@ Begin your analysis and action:"""
             self.console.print(f"[red]Error: {e}[/red]")
             return
 
-        # Verify trader exists
-        trader_db = TraderDatabase()
-        trader_db.initialize()
-        trader = trader_db.get_trader(trader_id)
-        trader_db.close()
-
-        if not trader:
-            self.console.print(f"[yellow]Trader with ID '{trader_id}' not found[/yellow]")
-            return
+        # Start fetching the current price so the request is in flight while
+        # the trader is looked up
+        price_service = get_price_service()
+        price_task = asyncio.create_task(price_service.fetch_current_price(exchange, symbol))
+        await asyncio.sleep(0)
 
-        # Fetch current price
         try:
-            price_service = get_price_service()
-            entry_price = await price_service.fetch_current_price(exchange, symbol)
-        except Exception as e:
-            self.console.print(f"[red]Error: fetchpricefailed {exchange} {symbol}: {e}[/red]")
-            return
+            self._init_databases()
+            trader_db = self.trader_db
+            pos_db = self.pos_db
+
+            # Verify trader exists
+            trader = trader_db.get_trader(trader_id)
+
+            if not trader:
+                self.console.print(f"[yellow]Trader with ID '{trader_id}' not found[/yellow]")
+                return
+
+            # Fetch current price
+            try:
+                entry_price = await price_task
+            except Exception as e:
+                self.console.print(f"[red]Error: fetchpricefailed {exchange} {symbol}: {e}[/red]")
+                return
+        finally:
+            # Don't leave the fetch running or its exception unretrieved
+            if not price_task.done():
+                price_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await price_task
 
         # Calculate fee
         try:
@@ -4048,24 +4675,15 @@ Begin your analysis and action:"""
             unrealized_pnl=0.0,  # Will be updated by price service
         )
 
-        # Calculate liquidation price
-        position.liquidation_price = position.calculate_liquidation_price()
-
         # Save to database
-        pos_db = PositionDatabase()
-        pos_db.initialize()
-
         try:
             position_id = pos_db.add_position(position)
 
             # Update trader balance and equity
             # Balance decreases by margin + fee
             # Equity = balance + unrealized_pnl (initially 0 for new position)
-            trader_db = TraderDatabase()
-            trader_db.initialize()
             balance_change = -(margin + entry_fee)
             trader_db.update_balance_and_equity(trader_id, balance_change=balance_change)
-            trader_db.close()
 
             self.console.print(f"[green]✓ positionhas beenopen[/green]")
             self.console.print(f"  [dim]ID:[/dim] {position_id}")
@@ -4081,10 +4699,7 @@ Begin your analysis and action:"""
             self.console.print(f"  [dim]liquidation price:[/dim] {position.liquidation_price:.2f}")
         except Exception as e:
             self.console.print(f"[red]Error: savepositionfailed: {e}[/red]")
-            import traceback
             self.console.print(f"[dim]{traceback.format_exc()}[/dim]")
-        finally:
-            pos_db.close()
 
     async def _handle_closeposition_command(self, args: list):
         """Handle closing a position (called from /positions command with -c flag)
@@ -4109,8 +4724,9 @@ Begin your analysis and action:"""
             return
 
         # Get position from database
-        pos_db = PositionDatabase()
-        pos_db.initialize()
+        self._init_databases()
+        trader_db = self.trader_db
+        pos_db = self.pos_db
 
         try:
             position = pos_db.get_position(position_id)
@@ -4133,7 +4749,6 @@ Begin your analysis and action:"""
             else:
                 # Fetch current price using configured exchange
                 try:
-                    from .scheduler_config import get_scheduler_config
                     config = get_scheduler_config()
                     configured_exchange = config.get_string('indicator.exchange', 'okx')
 
@@ -4149,7 +4764,6 @@ Begin your analysis and action:"""
 
             # Calculate exit fee using configured exchange
             try:
-                from .scheduler_config import get_scheduler_config
                 config = get_scheduler_config()
                 configured_exchange = config.get_string('indicator.exchange', 'okx')
                 exit_fee = calculate_fee(configured_exchange, position.position_size, exit_price)
@@ -4167,19 +4781,14 @@ Begin your analysis and action:"""
                 # Update trader balance and equity
                 # Balance change: margin returned + realized_pnl
                 # realized_pnl already includes fees deduction
-                trader_db = TraderDatabase()
-                trader_db.initialize()
-
+                # Equity = new balance + remaining unrealized PnL from other open positions
                 balance_change = closed_position.margin + closed_position.realized_pnl
-                trader_db.update_balance_and_equity(position.trader_id, balance_change=balance_change)
-
-                # Update equity with remaining unrealized PnL from other open positions
                 position_summary = pos_db.get_trader_positions_summary(position.trader_id)
-                trader_db.update_equity_with_unrealized_pnl(
+                trader_db.apply_close(
                     position.trader_id,
+                    balance_change,
                     position_summary['total_unrealized_pnl']
                 )
-                trader_db.close()
 
                 pnl_color = "green" if closed_position.realized_pnl > 0 else "red"
                 self.console.print(f"[green]✓ positionhas beenclose[/green]")
@@ -4197,10 +4806,7 @@ Begin your analysis and action:"""
 
         except Exception as e:
             self.console.print(f"[red]Error: {e}[/red]")
-            import traceback
             self.console.print(f"[dim]{traceback.format_exc()}[/dim]")
-        finally:
-            pos_db.close()
 
     async def _handle_positions_command(self, args: list):
         """processing /positions command
@@ -4284,9 +4890,6 @@ Begin your analysis and action:"""
             return
 
         # Case 4: Show all traders' positions (default)
-        from rich.table import Table
-        from rich.panel import Panel
-        from rich.text import Text as RichText
         from rich.columns import Columns
 
         # Initialize databases
@@ -4362,15 +4965,16 @@ Begin your analysis and action:"""
                 table.add_column("ROI %", style="white", width=10)
                 table.add_column("status", style="white", width=10)
 
-                # Sort by PnL
-                sorted_positions = sorted(
-                    positions,
-                    key=lambda p: p.unrealized_pnl if p.status == PositionStatus.OPEN else p.realized_pnl,
-                    reverse=True
-                )
+                # Sort by PnL, computing each position's key once
+                pnls = [
+                    p.unrealized_pnl if p.status is PositionStatus.OPEN else p.realized_pnl
+                    for p in positions
+                ]
+                order = sorted(range(len(positions)), key=pnls.__getitem__, reverse=True)
 
-                for pos in sorted_positions:
-                    pnl = pos.unrealized_pnl if pos.status == PositionStatus.OPEN else pos.realized_pnl
+                for i in order:
+                    pos = positions[i]
+                    pnl = pnls[i]
                     pnl_color = "green" if pnl > 0 else "red" if pnl < 0 else "white"
                     pnl_str = f"[{pnl_color}]{pnl:+.2f}[/{pnl_color}]"
 
@@ -4402,7 +5006,7 @@ Begin your analysis and action:"""
                 self.console.print("\n", table)
 
                 # Display summary for this trader
-                summary_text = RichText()
+                summary_text = Text()
                 summary_text.append(f"Total positions: {summary['total_positions']}\n", style="white")
                 summary_text.append(f"Open: {summary['open_positions']}\n", style="green")
                 summary_text.append(f"has beenclose: {summary['closed_positions']}\n", style="yellow")
@@ -4436,7 +5040,7 @@ Begin your analysis and action:"""
             total_unrealized_pnl = sum(item['summary']['total_unrealized_pnl'] for item in traders_with_positions)
             total_realized_pnl = sum(item['summary']['total_realized_pnl'] for item in traders_with_positions)
 
-            overall_text = RichText()
+            overall_text = Text()
             overall_text.append(f"tradertotalnumber: {len(traders)}\n", style="cyan")
             overall_text.append(f"Total positionsnumber: {total_positions}\n", style="white")
             overall_text.append(f"Open: {total_open}\n", style="green")
@@ -4454,7 +5058,6 @@ Begin your analysis and action:"""
 
         except Exception as e:
             self.console.print(f"[red]Error: {e}[/red]")
-            import traceback
             self.console.print(f"[dim]{traceback.format_exc()}[/dim]")
         finally:
             pos_db.close()
@@ -4468,10 +5071,6 @@ Begin your analysis and action:"""
         Args:
             args: Command arguments (trader_id)
         """
-        import os
-        import subprocess
-        import time
-
         # Initialize activity log database
         log_db = ActivityLogDatabase()
         log_db.initialize()
@@ -4559,8 +5158,6 @@ Begin your analysis and action:"""
             self.console.print(f"  [dim]File:[/dim] {trader_file}\n")
 
             # Display current performance summary
-            from rich.panel import Panel
-            from rich.text import Text
 
             perf_text = Text()
             perf_text.append(f"initialstartbalance: {initial_balance:.2f} USDT\n", style="white")
@@ -4592,7 +5189,7 @@ Begin your analysis and action:"""
                 return
 
             # Find Claude Code executable
-            claude_path = shutil.which("claude")
+            claude_path = self._get_claude_path()
             if not claude_path:
                 self.console.print("[red]Error: notfound Claude Code canexecuteFile[/red]")
                 self.console.print("[yellow]Please visit https://code.claude.com install Claude Code[/yellow]")
@@ -4625,7 +5222,6 @@ Begin your analysis and action:"""
             log_data['position_history'] = position_details
 
             # Convert to readable format for Claude
-            import json
             positions_json = json.dumps(position_details, indent=2, ensure_ascii=False)
 
             # Prepare comprehensive optimization instructions
@@ -4709,16 +5305,15 @@ Begin your optimization analysis now."""
                 process = subprocess.Popen(
                     [claude_path, "--print", instructions],
                     cwd=str(os.path.dirname(trader_file)),
+                    stdin=subprocess.DEVNULL,
                     stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1
+                    stderr=subprocess.STDOUT
                 )
 
                 # Stream output in real-time
                 output_lines = []
                 try:
-                    for line in process.stdout:
+                    for line in _iter_output_lines(process.stdout):
                         output_lines.append(line.rstrip())
                         self.console.print(f"[dim]{line.rstrip()}[/dim]")
                 except Exception as e:
@@ -4807,14 +5402,12 @@ Begin your optimization analysis now."""
                 log_data['error_message'] = 'Execution timeout'
             except Exception as e:
                 self.console.print(f"[red]Error: {e}[/red]")
-                import traceback
                 self.console.print(f"[dim]{traceback.format_exc()}[/dim]")
                 log_data['status'] = 'ERROR'
                 log_data['error_message'] = str(e)
 
         except Exception as e:
             self.console.print(f"[red]Error: {e}[/red]")
-            import traceback
             self.console.print(f"[dim]{traceback.format_exc()}[/dim]")
             log_data['status'] = 'ERROR'
             log_data['error_message'] = str(e)
@@ -4913,7 +5506,6 @@ Begin your optimization analysis now."""
         Args:
             args: [key] [value] or 'list' or 'reset'
         """
-        from .scheduler_config import get_scheduler_config
 
         config = get_scheduler_config()
 
@@ -4977,7 +5569,6 @@ Begin your optimization analysis now."""
         Args:
             config: SchedulerConfig instance
         """
-        from rich.table import Table
 
         all_config = config.get_all()
 
@@ -5038,9 +5629,6 @@ Begin your optimization analysis now."""
         Args:
             args: Command arguments
         """
-        from rich.table import Table
-        from rich.panel import Panel
-        from rich.text import Text
 
         log_db = ActivityLogDatabase()
         log_db.initialize()
@@ -5311,71 +5899,28 @@ Begin your optimization analysis now."""
                     if not command:
                         continue
 
-                    # Commands that output directly to console
-                    console_commands = {"/market", "/pairs", "/intervals", "/traders",
-                                       "/indicators", "/decide", "/positions", "/optimize",
-                                       "/config", "/logs"}
+                    handler = self._console_handlers.get(command)
 
-                    if command in console_commands:
+                    if handler is not None:
                         # Clear screen, run command, then restore UI
                         self.console.clear()
                         try:
-                            if command == "/market":
-                                await self._handle_rest_command(args)
-                            elif command == "/pairs":
-                                await self._handle_pairs_command(args)
-                            elif command == "/intervals":
-                                await self._handle_intervals_command(args)
-                            elif command == "/traders":
-                                await self._handle_traders_command(args)
-                            elif command == "/indicators":
-                                await self._handle_indicators_command(args)
-                            elif command == "/decide":
-                                await self._handle_decide_command(args)
-                            elif command == "/positions":
-                                await self._handle_positions_command(args)
-                            elif command == "/optimize":
-                                await self._handle_optimize_command(args)
-                            elif command == "/config":
-                                await self._handle_config_command(args)
-                            elif command == "/logs":
-                                await self._handle_logs_command(args)
+                            await handler(args)
 
                             input("\nPress Enter to continue...")
                         finally:
                             self._refresh_display()
 
-                    elif command in ("/quit", "/exit", "quit", "exit"):
+                    elif command in _QUIT_COMMANDS:
                         self.console.print("[yellow]Goodbye![/yellow]")
                         break
 
-                    elif command == "/help":
-                        self.cli_ui.add_output("Available Commands:", "cyan")
-                        self.cli_ui.add_output("  /start [trader_ids...]  - Start scheduler", "white")
-                        self.cli_ui.add_output("  /stop                   - Stop scheduler", "white")
-                        self.cli_ui.add_output("  /status                 - View status", "white")
-                        self.cli_ui.add_output("  /traders [...]          - Manage traders", "white")
-                        self.cli_ui.add_output("  /decide <trader_id>     - Make decision", "white")
-                        self.cli_ui.add_output("  /optimize <trader_id>   - Optimize trader", "white")
-                        self.cli_ui.add_output("  /positions [...]        - Manage positions", "white")
-                        self.cli_ui.add_output("  /market [...]           - Get market data", "white")
-                        self.cli_ui.add_output("  /quit or /exit          - Exit", "white")
-                        self._refresh_display()
-
-                    elif command == "/start":
-                        await self._handle_start_command(args)
-                        self._refresh_display()
-
-                    elif command == "/stop":
-                        await self._handle_stop_command(args)
-                        self._refresh_display()
-
-                    elif command == "/status":
-                        await self._handle_status_command(args)
-                        self._refresh_display()
-
                     else:
-                        self.cli_ui.add_output(f"Unknown command: {command}", "red")
+                        handler = self._ui_handlers.get(command)
+                        if handler is not None:
+                            await handler(args)
+                        else:
+                            self.cli_ui.add_output(f"Unknown command: {command}", "red")
                         self._refresh_display()
 
                 except (KeyboardInterrupt, EOFError):
@@ -5398,9 +5943,35 @@ Begin your optimization analysis now."""
             if self.scheduler and self.scheduler.running:
                 await self.scheduler.stop()
 
+            # Close CLI-lifetime database connections
+            self._close_databases()
+
+            # Stop indicator worker processes
+            self._shutdown_indicator_pool()
+
+            # Close the Anthropic API client's connection pool
+            if self._anthropic is not None:
+                await self._anthropic.close()
+
+    async def _handle_help_command(self, args: list):
+        """Write the command list to the UI output panel
+
+        Args:
+            args: Command arguments (unused)
+        """
+        self.cli_ui.add_output("Available Commands:", "cyan")
+        self.cli_ui.add_output("  /start [trader_ids...]  - Start scheduler", "white")
+        self.cli_ui.add_output("  /stop                   - Stop scheduler", "white")
+        self.cli_ui.add_output("  /status                 - View status", "white")
+        self.cli_ui.add_output("  /traders [...]          - Manage traders", "white")
+        self.cli_ui.add_output("  /decide <trader_id>     - Make decision", "white")
+        self.cli_ui.add_output("  /optimize <trader_id>   - Optimize trader", "white")
+        self.cli_ui.add_output("  /positions [...]        - Manage positions", "white")
+        self.cli_ui.add_output("  /market [...]           - Get market data", "white")
+        self.cli_ui.add_output("  /quit or /exit          - Exit", "white")
+
     async def _auto_refresh_loop(self):
         """Auto-refresh loop - updates display when new data arrives"""
-        import time
         last_ui_check = time.time()
         last_price_update = time.time()
         price_update_interval = 10.0  # Update prices every 10 seconds
@@ -5432,12 +6003,12 @@ Begin your optimization analysis now."""
                 # Update prices silently
                 if current_time - last_price_update >= price_update_interval:
                     if self.scheduler and self.scheduler.running and self.cli_ui.monitored_trader_ids:
-                        from .price_service import get_price_service
                         price_service = get_price_service()
                         try:
                             for trader_id in self.cli_ui.monitored_trader_ids:
                                 try:
                                     await price_service.update_trader_positions(trader_id, self.pos_db)
+                                    self.cli_ui.invalidate_summary(trader_id)
                                 except:
                                     pass
                         except:
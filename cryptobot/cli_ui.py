@@ -3,8 +3,12 @@
 Split-screen UI with dashboard and command output
 """
 
-from typing import List, Dict, Any
-from datetime import datetime
+import functools
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timedelta
 
 from rich.console import Console
 from rich.table import Table
@@ -14,6 +18,69 @@ from rich.layout import Layout
 from rich.columns import Columns
 
 
+_ONE_MINUTE = timedelta(minutes=1)
+_ONE_HOUR = timedelta(hours=1)
+
+# Seconds a trader's position summary is reused across renders
+_SUMMARY_TTL = 0.5
+
+# Map log levels to output styles
+_STYLE_MAP = {
+    "info": "cyan",
+    "warning": "yellow",
+    "error": "red",
+    "success": "green",
+    "decide": "blue",
+    "optimize": "magenta",
+    "trigger": "yellow",
+    "thinking": "dim",
+}
+
+# Shared read-only default for per-trader lookups
+_EMPTY = MappingProxyType({})
+
+# Scheduler status shown in the dashboard title
+_STATUS_RUNNING = "[green]●[/green] Running"
+_STATUS_STOPPED = "[dim]○[/dim] Stopped"
+
+
+@functools.lru_cache(maxsize=2048)
+def _pnl_markup(sign: int, cents: int) -> str:
+    """Format a PnL cell
+
+    Args:
+        sign: Sign of the PnL (1, -1 or 0)
+        cents: Absolute PnL rounded to cents
+
+    Returns:
+        PnL string with Rich color markup
+    """
+    if sign > 0:
+        return f"[green]+${cents / 100:.2f}[/green]"
+    elif sign < 0:
+        return f"[red]-${cents / 100:.2f}[/red]"
+    else:
+        return "[dim]$0.00[/dim]"
+
+
+def _time_ago_str(elapsed: timedelta, show_seconds: bool) -> str:
+    """Format the time elapsed since an event
+
+    Args:
+        elapsed: Time since the event
+        show_seconds: Show seconds when less than a minute has passed
+
+    Returns:
+        Elapsed time such as "42s", "5m" or "3h"
+    """
+    if show_seconds and elapsed < _ONE_MINUTE:
+        return f"{elapsed.seconds}s"
+    elif elapsed < _ONE_HOUR:
+        return f"{elapsed.seconds // 60}m"
+    else:
+        return f"{elapsed.seconds // 3600}h"
+
+
 class CLIInterface:
     """Manages the CLI interface with split-screen layout"""
 
@@ -35,16 +102,28 @@ class CLIInterface:
         self.scheduler_tasks: Dict[str, Dict] = {}
         self.scheduler_running = False
 
-        # Output history
-        self.output_history: List[Dict[str, Any]] = []
+        # Output history (ring buffer of the last 100 messages)
+        self.output_history: deque = deque(maxlen=100)
+        # The last 12 messages, as shown in the output panel
+        self._output_tail: deque = deque(maxlen=12)
+
+        # Position summaries: trader_id -> (monotonic fetch time, summary)
+        self._summary_cache: Dict[str, tuple] = {}
+
+        # Render memo: bumped by every mutator so render() can reuse its last result
+        self._rev = 0
+        self._last_render_key = None
+        self._last_renderables = None
 
     def set_scheduler_running(self, running: bool):
         """Set scheduler running state"""
         self.scheduler_running = running
+        self._rev += 1
 
     def set_monitored_traders(self, trader_ids: List[str]):
         """Set monitored traders"""
         self.monitored_trader_ids = trader_ids
+        self._rev += 1
         for trader_id in trader_ids:
             if trader_id not in self.decision_results:
                 self.decision_results[trader_id] = {
@@ -56,6 +135,7 @@ class CLIInterface:
 
     def update_decision_result(self, trader_id: str, result: str, action: str):
         """Update decision result"""
+        self._rev += 1
         if action == 'optimize':
             self.last_optimize_times[trader_id] = datetime.now()
         else:
@@ -63,21 +143,55 @@ class CLIInterface:
                 'last_decision': result,
                 'last_decision_time': datetime.now(),
             }
+            # The decision may have opened or closed positions
+            self.invalidate_summary(trader_id)
+
+    def invalidate_summary(self, trader_id: Optional[str] = None):
+        """Drop cached position summaries after positions change
+
+        Args:
+            trader_id: Trader whose summary is stale, or None for all traders
+        """
+        self._rev += 1
+        if trader_id is None:
+            self._summary_cache.clear()
+        else:
+            self._summary_cache.pop(trader_id, None)
+
+    def _get_summary(self, trader_id: str) -> Dict[str, Any]:
+        """Get a trader's position summary, reusing it for _SUMMARY_TTL seconds
+
+        Args:
+            trader_id: Trader ID
+
+        Returns:
+            Summary from PositionDatabase.get_trader_positions_summary
+        """
+        now = time.monotonic()
+        cached = self._summary_cache.get(trader_id)
+        if cached and now - cached[0] < _SUMMARY_TTL:
+            return cached[1]
+
+        summary = self.position_db.get_trader_positions_summary(trader_id)
+        self._summary_cache[trader_id] = (now, summary)
+        return summary
 
     def update_scheduler_tasks(self, tasks: Dict[str, Dict]):
         """Update scheduler tasks"""
         self.scheduler_tasks = tasks
+        self._rev += 1
 
     def add_output(self, message: str, style: str = "white"):
         """Add output message"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.output_history.append({
+        entry = {
             'time': timestamp,
             'message': message,
             'style': style
-        })
-        if len(self.output_history) > 100:
-            self.output_history.pop(0)
+        }
+        self.output_history.append(entry)
+        self._output_tail.append(entry)
+        self._rev += 1
 
     def log(self, message: str, level: str = "info", detail_lines: List[str] = None, trader_id: str = None):
         """Log message (for compatibility with scheduler)
@@ -88,18 +202,7 @@ class CLIInterface:
             detail_lines: Optional list of detail lines
             trader_id: Optional trader ID
         """
-        # Map log levels to output styles
-        style_map = {
-            "info": "cyan",
-            "warning": "yellow",
-            "error": "red",
-            "success": "green",
-            "decide": "blue",
-            "optimize": "magenta",
-            "trigger": "yellow",
-            "thinking": "dim",
-        }
-        style = style_map.get(level, "white")
+        style = _STYLE_MAP.get(level, "white")
 
         # Add trader_id prefix if provided
         if trader_id:
@@ -137,48 +240,38 @@ class CLIInterface:
             table.add_row("[dim]No traders[/dim]", "[dim]Use /start[/dim]", "", "", "", "")
             return table
 
-        from datetime import timedelta
+        # One timestamp for the whole render
+        now = datetime.now()
+
+        # Forget cached summaries for traders that are no longer monitored
+        for trader_id in [t for t in self._summary_cache if t not in self.monitored_trader_ids]:
+            del self._summary_cache[trader_id]
+
         for trader_id in self.monitored_trader_ids:
-            decision_info = self.decision_results.get(trader_id, {})
+            decision_info = self.decision_results.get(trader_id, _EMPTY)
             last_decision = decision_info.get('last_decision', 'none')
             last_decision_time = decision_info.get('last_decision_time')
 
             if last_decision_time:
-                time_ago = datetime.now() - last_decision_time
-                if time_ago < timedelta(minutes=1):
-                    time_str = f"{time_ago.seconds}s"
-                elif time_ago < timedelta(hours=1):
-                    time_str = f"{time_ago.seconds // 60}m"
-                else:
-                    time_str = f"{time_ago.seconds // 3600}h"
+                time_str = _time_ago_str(now - last_decision_time, True)
             else:
                 time_str = "-"
 
             last_optimize_time = self.last_optimize_times.get(trader_id)
             if last_optimize_time:
-                optimize_ago = datetime.now() - last_optimize_time
-                if optimize_ago < timedelta(hours=1):
-                    optimize_str = f"{optimize_ago.seconds // 60}m"
-                else:
-                    optimize_str = f"{optimize_ago.seconds // 3600}h"
+                optimize_str = _time_ago_str(now - last_optimize_time, False)
             else:
                 optimize_str = "[dim]-[/dim]"
 
-            summary = self.position_db.get_trader_positions_summary(trader_id)
+            summary = self._get_summary(trader_id)
             position_count = summary['open_positions']
             total_pnl = summary['total_unrealized_pnl'] + summary['total_realized_pnl']
 
-            if total_pnl > 0:
-                pnl_str = f"+${total_pnl:.2f}"
-                pnl_style = "green"
-            elif total_pnl < 0:
-                pnl_str = f"-${abs(total_pnl):.2f}"
-                pnl_style = "red"
-            else:
-                pnl_str = "$0.00"
-                pnl_style = "dim"
+            # Most ticks leave the PnL unchanged to the cent
+            pnl_sign = (total_pnl > 0) - (total_pnl < 0)
+            pnl_display = _pnl_markup(pnl_sign, round(abs(total_pnl) * 100))
 
-            task_info = self.scheduler_tasks.get(trader_id, {})
+            task_info = self.scheduler_tasks.get(trader_id, _EMPTY)
             is_processing = task_info.get('processing', False)
             trader_display = f"{'[yellow]⟳[/yellow] ' if is_processing else ''}{trader_id}"
 
@@ -190,7 +283,7 @@ class CLIInterface:
                 time_str,
                 optimize_str,
                 str(position_count),
-                f"[{pnl_style}]{pnl_str}[/{pnl_style}]"
+                pnl_display
             )
 
         return table
@@ -201,11 +294,16 @@ class CLIInterface:
         Returns:
             List of renderable objects
         """
+        # Reuse the last renderables when nothing changed within the same second.
+        # The second bucket keeps "time ago" ticking and bounds staleness from
+        # state mutated without a setter (e.g. task 'processing' flags), and
+        # scheduler_running is part of the key because callers assign it directly.
+        render_key = (self._rev, self.scheduler_running, int(time.monotonic()))
+        if render_key == self._last_render_key:
+            return self._last_renderables
+
         # Build status text
-        if self.scheduler_running:
-            status_text = "[green]●[/green] Running"
-        else:
-            status_text = "[dim]○[/dim] Stopped"
+        status_text = _STATUS_RUNNING if self.scheduler_running else _STATUS_STOPPED
 
         # Build dashboard
         dashboard = Panel(
@@ -218,10 +316,11 @@ class CLIInterface:
         if not self.output_history:
             output_content = Text("[dim]Ready. Type /help for commands.[/dim]", style="dim")
         else:
-            output_content = Text()
-            for entry in self.output_history[-12:]:
-                output_content.append(f"[{entry['time']}] ", style="dim")
-                output_content.append(entry['message'] + "\n", style=entry['style'])
+            parts = []
+            for entry in self._output_tail:
+                parts.append((f"[{entry['time']}] ", "dim"))
+                parts.append((entry['message'] + "\n", entry['style']))
+            output_content = Text.assemble(*parts)
 
         output = Panel(
             output_content,
@@ -229,4 +328,6 @@ class CLIInterface:
             border_style="dim"
         )
 
-        return [dashboard, output]
+        self._last_render_key = render_key
+        self._last_renderables = [dashboard, output]
+        return self._last_renderables
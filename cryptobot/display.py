@@ -3,17 +3,203 @@
 Beautiful terminal K-line data display using Rich library
 """
 
-from datetime import datetime
-from typing import Optional, List
+import functools
+import itertools
+import time
+from typing import Optional
 from array import array
 
-from rich.console import Console
+from rich.console import Console, ConsoleOptions, Group, RenderableType, RenderResult
+from rich.measure import Measurement
 from rich.live import Live
 from rich.table import Table
 from rich.panel import Panel
+from rich.segment import Segment
+from rich.style import Style
 from rich.text import Text
 
 
+# Chart cell codes stored in the chart grid, indexing _CHAR_TABLE
+_CELL_EMPTY, _CELL_SHADOW, _CELL_DOJI, _CELL_BODY_TOP, _CELL_BODY_BOTTOM, _CELL_BODY = range(6)
+_CHAR_TABLE = ("  ", "│ ", "─ ", "▀ ", "▄ ", "█ ")
+# str.translate() table turning a latin-1 decoded grid into chart characters
+_CHAR_TRANSLATION = {code: chars for code, chars in enumerate(_CHAR_TABLE)}
+
+# Chart color codes, indexing the table built from the COLOR_* attributes
+_COLOR_NONE, _COLOR_UP, _COLOR_DOWN, _COLOR_NEUTRAL = range(4)
+
+# Trend arrow per color code
+_TREND_SYMBOLS = ("", "↑", "↓", "→")
+
+# Parsed once instead of on every append
+_STYLE_DIM = Style.parse("dim")
+_STYLE_CYAN = Style.parse("cyan")
+_STYLE_BOLD = Style.parse("bold")
+_STYLE_WHITE = Style.parse("white")
+
+
+@functools.lru_cache(maxsize=32)
+def _price_labels(chart_max: float, chart_range: float, height: int) -> tuple:
+    """Build the Y-axis labels of a K-line chart
+
+    Args:
+        chart_max: Price at the top of the chart
+        chart_range: Price span of the chart
+        height: Chart height (rows)
+
+    Returns:
+        Tuple of one label per row, top row first
+    """
+    # Use height instead of height-1, consistent with position calculation
+    return tuple(
+        f"{chart_max - (row / height) * chart_range:8.2f} │"
+        for row in range(height)
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _time_axis(width: int) -> str:
+    """Build the X-axis line of a K-line chart
+
+    Args:
+        width: Number of candles
+
+    Returns:
+        Axis line string
+    """
+    return "         └" + "─ " * width
+
+
+@functools.lru_cache(maxsize=256)
+def _candle_column(
+    open_p: float,
+    high_p: float,
+    low_p: float,
+    close_p: float,
+    chart_max: float,
+    chart_range: float,
+    height: int,
+) -> tuple:
+    """Paint one candlestick column of a K-line chart
+
+    Args:
+        open_p: Open price
+        high_p: High price
+        low_p: Low price
+        close_p: Close price
+        chart_max: Price at the top of the chart
+        chart_range: Price span of the chart
+        height: Chart height (rows)
+
+    Returns:
+        Tuple of (cell codes, color codes) as bytes, top row first
+    """
+    # Map prices to rows (using height instead of height-1 to fill the entire
+    # height, clamped to 0..height-1 due to rounding)
+    top_row = height - 1
+
+    def to_row(price: float) -> int:
+        row = int((chart_max - price) / chart_range * height)
+        if row < 0:
+            return 0
+        return row if row < top_row else top_row
+
+    high_pos = to_row(high_p)
+    low_pos = to_row(low_p)
+    # The body spans from open to close whichever way the candle moved
+    body_top, body_bottom = sorted((to_row(open_p), to_row(close_p)))
+
+    cells = bytearray(height)
+
+    # Draw upper shadow (from high_pos to body_top, connect to body)
+    # If high_pos >= body_top, no upper shadow or shadow is covered by body
+    if high_pos < body_top:
+        cells[high_pos:body_top + 1] = bytes((_CELL_SHADOW,)) * (body_top + 1 - high_pos)
+
+    # Draw lower shadow (from body_bottom to low_pos, connect to body)
+    # If low_pos <= body_bottom, no lower shadow or shadow is covered by body
+    if low_pos > body_bottom:
+        cells[body_bottom:low_pos + 1] = bytes((_CELL_SHADOW,)) * (low_pos + 1 - body_bottom)
+
+    if body_top == body_bottom:
+        # Doji: open = close
+        cells[body_top] = _CELL_DOJI
+    else:
+        # Full body, then its top and bottom edges
+        cells[body_top:body_bottom + 1] = bytes((_CELL_BODY,)) * (body_bottom + 1 - body_top)
+        cells[body_top] = _CELL_BODY_TOP
+        cells[body_bottom] = _CELL_BODY_BOTTOM
+
+    # Every painted cell (shadows and body) takes the candle's color
+    if close_p > open_p:
+        color = _COLOR_UP
+    elif close_p < open_p:
+        color = _COLOR_DOWN
+    else:
+        color = _COLOR_NEUTRAL
+    colors = bytearray(height)
+    first = min(high_pos, body_top)
+    last = max(low_pos, body_bottom)
+    colors[first:last + 1] = bytes((color,)) * (last + 1 - first)
+
+    return bytes(cells), bytes(colors)
+
+
+@functools.lru_cache(maxsize=512)
+def _fmt_ts(ts: int) -> str:
+    """Format millisecond timestamp as HH:MM:SS
+
+    Args:
+        ts: Millisecond timestamp
+
+    Returns:
+        Formatted time string
+    """
+    t = time.localtime(ts // 1000)
+    return f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+
+
+@functools.lru_cache(maxsize=512)
+def _fmt_ts_short(ts: int) -> str:
+    """Format millisecond timestamp as HH:MM
+
+    Args:
+        ts: Millisecond timestamp
+
+    Returns:
+        Formatted time string
+    """
+    t = time.localtime(ts // 1000)
+    return f"{t.tm_hour:02d}:{t.tm_min:02d}"
+
+
+class _ChartRows:
+    """Pre-styled K-line chart rows
+
+    The rows are already split into styled segments, so they are handed to
+    Rich as-is instead of going through Text layout.
+    """
+
+    def __init__(self, lines: list, width: int):
+        """Initialize chart rows
+
+        Args:
+            lines: One list of Segments per row, without line breaks
+            width: Width of the widest row (cells)
+        """
+        self.lines = lines
+        self.width = width
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        new_line = Segment.line()
+        for segments in self.lines:
+            yield from segments
+            yield new_line
+
+    def __rich_measure__(self, console: Console, options: ConsoleOptions) -> Measurement:
+        return Measurement(self.width, self.width)
+
+
 class KlineDisplay:
     """K-line Data Display
 
@@ -35,9 +221,34 @@ class KlineDisplay:
         Args:
             console: Rich Console instance, creates new one if not provided
         """
-        self.console = console or Console()
-        self._kline_history: List[dict] = []
+        # Chart content carries explicit styles, so skip the highlighter
+        self.console = console or Console(highlight=False)
         self._max_history = 30  # Maximum 30 historical records
+        # K-line history as parallel arrays (one entry per K-line). Once full
+        # they act as a ring buffer: _head is the slot of the oldest K-line,
+        # so the newest is always at _head - 1
+        self._head = 0
+        self._ts = array('q')   # Open time (ms)
+        self._o = array('d')    # Open
+        self._h = array('d')    # High
+        self._l = array('d')    # Low
+        self._c = array('d')    # Close
+        self._v = array('d')    # Volume
+        self._is_closed = bytearray()
+        self._columns = (self._ts, self._o, self._h, self._l, self._c, self._v, self._is_closed)
+
+        # Chart styles indexed by color code (_COLOR_NONE has no style)
+        self._color_styles = (
+            None,
+            Style.parse(self.COLOR_UP),
+            Style.parse(self.COLOR_DOWN),
+            Style.parse(self.COLOR_NEUTRAL),
+        )
+
+        # Last generate_renderable() result, reused until the history changes
+        self._history_rev = 0  # Bumped on every history change
+        self._renderable_cache_key = None
+        self._renderable_cache_val = None
 
     def _format_timestamp(self, ts: int) -> str:
         """Format timestamp
@@ -48,8 +259,7 @@ class KlineDisplay:
         Returns:
             Formatted time string
         """
-        dt = datetime.fromtimestamp(ts / 1000)
-        return dt.strftime("%H:%M:%S")
+        return _fmt_ts(ts)
 
     def _format_timestamp_short(self, ts: int) -> str:
         """Format timestamp (short format)
@@ -60,25 +270,17 @@ class KlineDisplay:
         Returns:
             Formatted time string
         """
-        dt = datetime.fromtimestamp(ts / 1000)
-        return dt.strftime("%H:%M")
-
-    def _get_color(self, open_price: float, close_price: float) -> str:
-        """Get color based on price movement
+        return _fmt_ts_short(ts)
 
-        Args:
-            open_price: Open price
-            close_price: Close price
+    def _slots(self):
+        """Get history slots in chronological order
 
         Returns:
-            Color name
+            Iterable of array indices, oldest K-line first
         """
-        if close_price > open_price:
-            return self.COLOR_UP
-        elif close_price < open_price:
-            return self.COLOR_DOWN
-        else:
-            return self.COLOR_NEUTRAL
+        if not self._head:
+            return range(len(self._ts))
+        return itertools.chain(range(self._head, len(self._ts)), range(self._head))
 
     def _create_kline_chart(self) -> Panel:
         """Create ASCII K-line chart
@@ -86,14 +288,12 @@ class KlineDisplay:
         Returns:
             Rich Panel object containing K-line chart
         """
-        if not self._kline_history:
+        if not self._ts:
             return Panel("[dim]Waiting for data...[/dim]", title="K-line Chart", style="dim")
 
         # Get price range
-        all_highs = [k["high"] for k in self._kline_history]
-        all_lows = [k["low"] for k in self._kline_history]
-        min_price = min(all_lows)
-        max_price = max(all_highs)
+        min_price = min(self._l)
+        max_price = max(self._h)
         price_range = max_price - min_price
 
         if price_range == 0:
@@ -107,116 +307,92 @@ class KlineDisplay:
 
         # Create chart grid (height x width)
         height = self.CHART_HEIGHT
-        width = min(len(self._kline_history), self._max_history)
-
-        # Use character art, store (char, color)
-        grid = [[("  ", None) for _ in range(width)] for _ in range(height)]
-
-        # Draw each K-line (candlestick)
-        for i, kline in enumerate(self._kline_history[-width:]):
-            open_p = kline["open"]
-            close_p = kline["close"]
-            high_p = kline["high"]
-            low_p = kline["low"]
-
-            # Calculate positions (using height instead of height-1 to fill entire height)
-            high_pos = int((chart_max - high_p) / chart_range * height)
-            low_pos = int((chart_max - low_p) / chart_range * height)
-            open_pos = int((chart_max - open_p) / chart_range * height)
-            close_pos = int((chart_max - close_p) / chart_range * height)
-
-            # Ensure within range (clamp to 0 to height-1 due to rounding)
-            high_pos = max(0, min(height - 1, high_pos))
-            low_pos = max(0, min(height - 1, low_pos))
-            open_pos = max(0, min(height - 1, open_pos))
-            close_pos = max(0, min(height - 1, close_pos))
-
-            # Get color
-            color = self._get_color(open_p, close_p)
-
-            # Draw body (from open to close)
-            body_top = min(open_pos, close_pos)
-            body_bottom = max(open_pos, close_pos)
-
-            # Draw upper shadow (from high_pos to body_top, connect to body)
-            # If high_pos >= body_top, no upper shadow or shadow is covered by body
-            if high_pos < body_top:
-                for pos in range(high_pos, body_top + 1):
-                    grid[pos][i] = ("│ ", color)
-
-            # Draw lower shadow (from body_bottom to low_pos, connect to body)
-            # If low_pos <= body_bottom, no lower shadow or shadow is covered by body
-            if low_pos > body_bottom:
-                for pos in range(body_bottom, low_pos + 1):
-                    grid[pos][i] = ("│ ", color)
-
-            if body_top == body_bottom:
-                # Doji: open = close
-                grid[body_top][i] = ("─ ", color)
-            else:
-                for pos in range(body_top, body_bottom + 1):
-                    if pos == body_top:
-                        grid[pos][i] = ("▀ ", color)
-                    elif pos == body_bottom:
-                        grid[pos][i] = ("▄ ", color)
-                    else:
-                        grid[pos][i] = ("█ ", color)
+        width = min(len(self._ts), self._max_history)
 
-        # Build chart using Rich Text
-        from rich.text import Text
-        from rich.console import Group as RichGroup
+        # Use character art: two flat row-major grids of cell codes, one byte
+        # per cell for the character and one for its color
+        chars = bytearray(height * width)
+        colors = bytearray(height * width)
+
+        # Paint each K-line (candlestick) column; the history never exceeds
+        # width records. Columns are cached by candle and scale, so only
+        # candles that changed (or all of them, after a rescale) are repainted
+        o, h, l, c = self._o, self._h, self._l, self._c
+        candle_column = _candle_column
+        for i, k in enumerate(self._slots()):
+            chars[i::width], colors[i::width] = candle_column(o[k], h[k], l[k], c[k], chart_max, chart_range, height)
 
+        # Build chart using Rich Text
         renderables = []
+        color_styles = self._color_styles
 
         # Draw Y-axis scale and chart
-        for row in range(height):
-            # Use height instead of height-1, consistent with position calculation
-            price = chart_max - (row / height) * chart_range
-            price_label = f"{price:8.2f} │"
+        # Labels only change when the price range does, so they are cached
+        price_labels = _price_labels(chart_max, chart_range, height)
 
-            line_text = Text()
-            line_text.append(price_label)
+        # Translate the whole grid in one pass; every cell becomes two characters
+        grid = chars.decode("latin-1").translate(_CHAR_TRANSLATION)
 
-            for cell in grid[row]:
-                char, color = cell
-                if color:
-                    line_text.append(char, style=color)
-                else:
-                    line_text.append(char)
-
-            renderables.append(line_text)
+        lines = []
+        for row in range(height):
+            price_label = price_labels[row]
+
+            # One segment per stretch of same-colored cells instead of one
+            # per cell
+            segments = [Segment(price_label)]
+            start = row * width
+            end = start + width
+            run_start = start
+            while run_start < end:
+                color = colors[run_start]
+                run_end = run_start + 1
+                while run_end < end and colors[run_end] == color:
+                    run_end += 1
+                segments.append(Segment(grid[2 * run_start:2 * run_end], color_styles[color]))
+                run_start = run_end
+            lines.append(segments)
+
+        # Every row has the same layout; only the label may differ in width
+        rows_width = max(len(label) for label in price_labels) + 2 * width
+        renderables.append(_ChartRows(lines, rows_width))
 
         # Draw X-axis (time)
-        time_line = "         └" + "─ " * width
-        renderables.append(Text(time_line))
+        renderables.append(Text(_time_axis(width)))
 
         time_labels = Text("         ")
-        for i, kline in enumerate(self._kline_history[-width:]):
+        for i, k in enumerate(self._slots()):
             if i % 5 == 0:  # Show time label every 5 candlesticks
-                ts = self._format_timestamp_short(kline["timestamp"])
+                ts = self._format_timestamp_short(self._ts[k])
                 time_labels.append(ts[:2] + " ")
             else:
                 time_labels.append("  ")
         renderables.append(time_labels)
 
         # Add latest price information
-        if self._kline_history:
-            latest = self._kline_history[-1]
-            change = latest["close"] - latest["open"]
-            change_pct = (change / latest["open"]) * 100
-            change_color = self.COLOR_UP if change > 0 else self.COLOR_DOWN if change < 0 else "white"
+        if self._ts:
+            latest = self._head - 1
+            change = self._c[latest] - self._o[latest]
+            change_pct = (change / self._o[latest]) * 100
+            change_style = (
+                color_styles[_COLOR_UP] if change > 0
+                else color_styles[_COLOR_DOWN] if change < 0
+                else _STYLE_WHITE
+            )
             change_sign = "+" if change > 0 else ""
 
-            info = (
-                f"\n[bold]Latest:[/bold] {latest['close']:.2f}  "
-                f"[bold]Change:[/bold] [{change_color}]{change_sign}{change:.2f} ({change_pct:.2f}%)[/]  "
-                f"[bold]High:[/bold] {latest['high']:.2f}  "
-                f"[bold]Low:[/bold] {latest['low']:.2f}  "
-                f"[bold]Volume:[/bold] {latest['volume']:.2f}"
+            # Styled parts instead of markup, which Text() would not parse
+            info = Text.assemble(
+                "\n", ("Latest:", _STYLE_BOLD), f" {self._c[latest]:.2f}  ",
+                ("Change:", _STYLE_BOLD), " ",
+                (f"{change_sign}{change:.2f} ({change_pct:.2f}%)", change_style), "  ",
+                ("High:", _STYLE_BOLD), f" {self._h[latest]:.2f}  ",
+                ("Low:", _STYLE_BOLD), f" {self._l[latest]:.2f}  ",
+                ("Volume:", _STYLE_BOLD), f" {self._v[latest]:.2f}",
+                justify="left",
             )
-            renderables.append(Text(info, justify="left"))
+            renderables.append(info)
 
-        return Panel(RichGroup(*renderables), title="K-line Chart", style="dim")
+        return Panel(Group(*renderables), title="K-line Chart", style="dim")
 
     def _create_kline_table(self) -> Table:
         """Create K-line data table
@@ -227,29 +403,31 @@ class KlineDisplay:
         table = Table(show_header=False, box=None, padding=(0, 1))
         table.add_column("K-line", style="cyan")
 
+        timestamps, opens, highs, lows, closes, volumes = (
+            self._ts, self._o, self._h, self._l, self._c, self._v
+        )
+        color_styles = self._color_styles
+        add_row = table.add_row
+
         # Show last 8 records
-        recent = self._kline_history[-8:]
-
-        for kline in recent:
-            open_p = kline["open"]
-            close_p = kline["close"]
-            color = self._get_color(open_p, close_p)
-            ts = self._format_timestamp(kline["timestamp"])
-
-            # Calculate K-line display
-            body_char = "█" if abs(close_p - open_p) > 0.01 else "─"
-            trend_symbol = "↑" if close_p > open_p else "↓" if close_p < open_p else "→"
-
-            line = (
-                f"[dim]{ts}[/dim]  "
-                f"[{color}]{trend_symbol}[/] "
-                f"O:[cyan]{open_p:.2f}[/cyan] "
-                f"H:[cyan]{kline['high']:.2f}[/cyan] "
-                f"L:[cyan]{kline['low']:.2f}[/cyan] "
-                f"C:[{color}]{close_p:.2f}[/] "
-                f"V:[dim]{kline['volume']:.2f}[/dim]"
+        for i in itertools.islice(self._slots(), max(0, len(timestamps) - 8), None):
+            open_p = opens[i]
+            close_p = closes[i]
+            color_code = _COLOR_UP if close_p > open_p else _COLOR_DOWN if close_p < open_p else _COLOR_NEUTRAL
+            color = color_styles[color_code]
+            ts = _fmt_ts(timestamps[i])
+
+            # Build styled parts directly instead of markup Rich has to parse
+            line = Text.assemble(
+                (ts, _STYLE_DIM), "  ",
+                (_TREND_SYMBOLS[color_code], color), " ",
+                "O:", (f"{open_p:.2f}", _STYLE_CYAN), " ",
+                "H:", (f"{highs[i]:.2f}", _STYLE_CYAN), " ",
+                "L:", (f"{lows[i]:.2f}", _STYLE_CYAN), " ",
+                "C:", (f"{close_p:.2f}", color), " ",
+                "V:", (f"{volumes[i]:.2f}", _STYLE_DIM),
             )
-            table.add_row(line)
+            add_row(line)
 
         return table
 
@@ -281,37 +459,50 @@ class KlineDisplay:
         Args:
             kline: K-line data dictionary
         """
-        # Check if we need to update the last K-line (same timestamp and not closed)
-        if self._kline_history:
-            last_kline = self._kline_history[-1]
-
-            # Same K-line (same timestamp): overwrite update
-            if last_kline["timestamp"] == kline["timestamp"]:
-                self._kline_history[-1] = kline
-                return
+        values = (
+            kline["timestamp"], kline["open"], kline["high"], kline["low"],
+            kline["close"], kline["volume"], bool(kline.get("is_closed", True)),
+        )
 
-            # Last K-line not closed: update it
-            if not last_kline.get("is_closed", True):
-                self._kline_history[-1] = kline
+        # Check if we need to update the last K-line (same timestamp and not closed)
+        # Same K-line (same timestamp) or last K-line not closed: overwrite update
+        latest = self._head - 1
+        if self._ts and (self._ts[latest] == kline["timestamp"] or not self._is_closed[latest]):
+            # Exchanges often resend an unchanged snapshot: nothing to redraw
+            if all(column[latest] == value for column, value in zip(self._columns, values)):
                 return
-
-        # New closed K-line or first K-line: append to end
-        self._kline_history.append(kline)
-        # Maintain history size
-        if len(self._kline_history) > self._max_history:
-            self._kline_history.pop(0)
+            for column, value in zip(self._columns, values):
+                column[latest] = value
+            self._history_rev += 1
+            return
+
+        # New closed K-line or first K-line: append to end until the history
+        # is full, then overwrite the oldest slot
+        if len(self._ts) < self._max_history:
+            for column, value in zip(self._columns, values):
+                column.append(value)
+        else:
+            for column, value in zip(self._columns, values):
+                column[self._head] = value
+            self._head = (self._head + 1) % self._max_history
+        self._history_rev += 1
 
     def clear_history(self):
         """Clear historical data"""
-        self._kline_history.clear()
+        for column in self._columns:
+            del column[:]
+        self._head = 0
+        self._history_rev += 1
 
-    def generate_display(
+    def generate_renderable(
         self,
         symbol: str,
         exchange: str,
         interval: str,
-    ) -> str:
-        """Generate display content
+    ) -> RenderableType:
+        """Generate display content as a Rich renderable
+
+        The result can be printed directly or passed to ``Live.update()``.
 
         Args:
             symbol: Trading pair
@@ -319,39 +510,17 @@ class KlineDisplay:
             interval: K-line interval
 
         Returns:
-            Formatted display string
+            Group of status panel, K-line chart and K-line table
         """
+        # Any kline change bumps the revision
+        cache_key = (self._history_rev, symbol, exchange, interval)
+        if cache_key == self._renderable_cache_key:
+            return self._renderable_cache_val
+
         chart = self._create_kline_chart()
         table = self._create_kline_table()
         panel = self._create_status_panel(symbol, exchange, interval)
 
-        # Use Console to capture output
-        with self.console.capture() as capture:
-            self.console.print(panel)
-            self.console.print(chart)
-            self.console.print(table)
-
-        return capture.get()
-
-    def display_live(
-        self,
-        symbol: str,
-        exchange: str,
-        interval: str,
-        stop_event,
-    ):
-        """Start Live Display
-
-        This is a generator that yields new display content on each K-line update
-
-        Args:
-            symbol: Trading pair
-            exchange: Exchange
-            interval: K-line interval
-            stop_event: Stop event (asyncio.Event)
-
-        Yields:
-            Formatted display content
-        """
-        while not stop_event.is_set():
-            yield self.generate_display(symbol, exchange, interval)
+        self._renderable_cache_key = cache_key
+        self._renderable_cache_val = Group(panel, chart, table)
+        return self._renderable_cache_val
@@ -3,16 +3,13 @@
 Supports K-line data retrieval for perpetual futures/swap from multiple exchanges
 """
 
-from typing import Callable, Dict, Any, List
+from typing import Dict, Any, List
 from .ccxt_adapter import (
     get_supported_exchanges as ccxt_get_supported_exchanges,
-    create_exchange_instance,
-    convert_user_symbol_to_ccxt,
-    find_matching_swap_market,
     ccxt_ohlcv_to_standard,
+    ccxt_ohlcv_batch_to_standard,
     fetch_ohlcv as ccxt_fetch_ohlcv,
     fetch_swap_markets as ccxt_fetch_swap_markets,
-    get_supported_timeframes,
 )
 
 
@@ -87,6 +84,9 @@ def build_rest_params(exchange: str, symbol: str, interval: str, limit: int) ->
 async def parse_rest_response_async(exchange: str, response: list, symbol: str, interval: str) -> list:
     """Parse REST API response (async version)
 
+    Parsing is pure CPU work on data already in memory, so this simply
+    delegates to parse_rest_response().
+
     Args:
         exchange: Exchange name
         response: OHLCV data list returned by CCXT
@@ -96,16 +96,11 @@ async def parse_rest_response_async(exchange: str, response: list, symbol: str,
     Returns:
         Standardized K-line data list
     """
-    klines = []
-    for ohlcv in response:
-        kline = ccxt_ohlcv_to_standard(exchange, symbol, interval, ohlcv)
-        if kline:
-            klines.append(kline)
-    return klines
+    return parse_rest_response(exchange, response, symbol, interval)
 
 
 def parse_rest_response(exchange: str, response: list, symbol: str, interval: str) -> list:
-    """Parse REST API response (sync version - will be called asynchronously)
+    """Parse REST API response (sync version)
 
     Args:
         exchange: Exchange name
@@ -116,8 +111,7 @@ def parse_rest_response(exchange: str, response: list, symbol: str, interval: st
     Returns:
         Standardized K-line data list
     """
-    # This will be replaced by async version in actual usage
-    return []
+    return ccxt_ohlcv_batch_to_standard(exchange, symbol, interval, response)
 
 
 # =============================================================================
@@ -193,10 +187,12 @@ def get_region_hint(exchange: str, error_code: int = None) -> str:
     Returns:
         Hint message
     """
-    exchange = exchange.lower()
-    if error_code == 451 and exchange in REGION_ERROR_HINTS:
-        return REGION_ERROR_HINTS[exchange]
-    return REGION_ERROR_HINTS.get(exchange, "")
+    # Keys are lowercase and callers usually pass lowercase names already;
+    # the hint is the same for every error code
+    hint = REGION_ERROR_HINTS.get(exchange)
+    if hint is None:
+        hint = REGION_ERROR_HINTS.get(exchange.lower(), "")
+    return hint
 
 
 # =============================================================================
@@ -3,7 +3,8 @@
 Provides fee calculation for various cryptocurrency exchanges.
 """
 
-from typing import Dict
+import functools
+from typing import Dict, Iterable, List, Tuple, Union
 
 
 # Exchange fee rates (maker/taker)
@@ -27,6 +28,12 @@ EXCHANGE_FEES: Dict[str, Dict[str, float]] = {
     },
 }
 
+# Flattened view of EXCHANGE_FEES for lookups: exchange -> (maker, taker)
+_FEE_TABLE: Dict[str, Tuple[float, float]] = {
+    name: (rates['maker'], rates['taker']) for name, rates in EXCHANGE_FEES.items()
+}
+_ORDER_TYPE_INDEX: Dict[str, int] = {'maker': 0, 'taker': 1}
+
 
 def calculate_fee(
     exchange: str,
@@ -54,18 +61,7 @@ def calculate_fee(
         >>> calculate_fee('binance', 0.5, 50000, 'maker')
         5.0
     """
-    exchange_lower = exchange.lower()
-
-    if exchange_lower not in EXCHANGE_FEES:
-        raise ValueError(
-            f"Unsupported exchange: {exchange}. "
-            f"Supported exchanges: {', '.join(EXCHANGE_FEES.keys())}"
-        )
-
-    if order_type not in ('maker', 'taker'):
-        raise ValueError(f"Invalid order type: {order_type}. Must be 'maker' or 'taker'")
-
-    fee_rate = EXCHANGE_FEES[exchange_lower][order_type]
+    fee_rate = get_exchange_fee(exchange, order_type)
 
     # Fee = position_size * price * fee_rate
     # This gives us the fee in the quote currency (USDT)
@@ -75,6 +71,52 @@ def calculate_fee(
     return fee
 
 
+def calculate_fees(
+    exchange: str,
+    position_sizes: Iterable[float],
+    prices: Iterable[float],
+    order_types: Union[str, Iterable[str]] = 'taker'
+) -> List[float]:
+    """Calculate trading fees for many positions on one exchange
+
+    Same result as calling calculate_fee() for each position, with the
+    exchange and order types validated once instead of per position.
+
+    Args:
+        exchange: Exchange name (binance, okx, bybit, bitget)
+        position_sizes: Position sizes in base currency
+        prices: Entry or exit prices, one per position
+        order_types: One order type for all positions, or one per position
+            ('maker' or 'taker', defaults to 'taker')
+
+    Returns:
+        Fee amounts in USDT, one per position
+
+    Raises:
+        ValueError: If exchange is not supported, an order_type is invalid, or
+            the inputs have different lengths
+
+    Examples:
+        >>> calculate_fees('binance', [0.5, 1.0], [50000, 40000])
+        [12.5, 20.0]
+        >>> calculate_fees('binance', [0.5, 1.0], [50000, 40000], ['maker', 'taker'])
+        [5.0, 20.0]
+    """
+    if isinstance(order_types, str):
+        fee_rate = get_exchange_fee(exchange, order_types)
+        return [size * price * fee_rate for size, price in zip(position_sizes, prices, strict=True)]
+
+    rates = (get_exchange_fee(exchange, 'maker'), get_exchange_fee(exchange, 'taker'))
+    fees = []
+    for size, price, order_type in zip(position_sizes, prices, order_types, strict=True):
+        index = _ORDER_TYPE_INDEX.get(order_type)
+        if index is None:
+            raise ValueError(f"Invalid order type: {order_type}. Must be 'maker' or 'taker'")
+        fees.append(size * price * rates[index])
+    return fees
+
+
+@functools.lru_cache(maxsize=64)
 def get_exchange_fee(exchange: str, order_type: str = 'taker') -> float:
     """Get the fee rate for an exchange
 
@@ -88,18 +130,20 @@ def get_exchange_fee(exchange: str, order_type: str = 'taker') -> float:
     Raises:
         ValueError: If exchange or order_type is invalid
     """
-    exchange_lower = exchange.lower()
+    # Callers usually pass lowercase names already
+    rates = _FEE_TABLE.get(exchange) or _FEE_TABLE.get(exchange.lower())
 
-    if exchange_lower not in EXCHANGE_FEES:
+    if rates is None:
         raise ValueError(
             f"Unsupported exchange: {exchange}. "
             f"Supported exchanges: {', '.join(EXCHANGE_FEES.keys())}"
         )
 
-    if order_type not in ('maker', 'taker'):
+    index = _ORDER_TYPE_INDEX.get(order_type)
+    if index is None:
         raise ValueError(f"Invalid order type: {order_type}. Must be 'maker' or 'taker'")
 
-    return EXCHANGE_FEES[exchange_lower][order_type]
+    return rates[index]
 
 
 def format_fee_percentage(fee_rate: float) -> str:
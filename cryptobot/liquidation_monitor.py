@@ -32,6 +32,32 @@ class LiquidationMonitor:
         self.running = False
         self._task: Optional[asyncio.Task] = None
         self._liquidated_positions: Set[int] = set()  # Track already liquidated positions
+        # Database connections kept open across checks (created on first use)
+        self._pos_db: Optional[PositionDatabase] = None
+        self._trader_db: Optional[TraderDatabase] = None
+
+    def _get_databases(self) -> tuple:
+        """Get the monitor's database connections, opening them on first use
+
+        Returns:
+            Tuple of (PositionDatabase, TraderDatabase)
+        """
+        if self._pos_db is None:
+            self._pos_db = PositionDatabase()
+            self._pos_db.initialize()
+        if self._trader_db is None:
+            self._trader_db = TraderDatabase()
+            self._trader_db.initialize()
+        return self._pos_db, self._trader_db
+
+    def _close_databases(self):
+        """Close the monitor's database connections"""
+        if self._pos_db is not None:
+            self._pos_db.close()
+            self._pos_db = None
+        if self._trader_db is not None:
+            self._trader_db.close()
+            self._trader_db = None
 
     async def check_and_liquidate_positions(self) -> List[Dict]:
         """Check all open positions and liquidate those that hit liquidation price
@@ -39,116 +65,152 @@ class LiquidationMonitor:
         Returns:
             List of liquidated position info dictionaries
         """
-        pos_db = PositionDatabase()
-        pos_db.initialize()
-
-        trader_db = TraderDatabase()
-        trader_db.initialize()
+        pos_db, trader_db = self._get_databases()
 
         liquidated_positions = []
 
-        try:
-            # Get all open positions
-            all_positions = pos_db.list_positions(status='open')
-
-            # Group positions by trader for efficient balance updates
-            trader_balance_updates: Dict[str, float] = {}
+        # Get all open positions
+        all_positions = pos_db.list_positions(status='open')
+
+        # Group positions by trader for efficient balance updates
+        trader_balance_updates: Dict[str, float] = {}
+
+        # Fetch prices with one bulk request per exchange, all exchanges
+        # concurrently
+        symbols_by_exchange: Dict[str, Set[str]] = {}
+        for position in all_positions:
+            if position.id not in self._liquidated_positions:
+                symbols_by_exchange.setdefault(position.exchange, set()).add(position.symbol)
+        exchanges = list(symbols_by_exchange)
+
+        price_service = get_price_service()
+        results = await asyncio.gather(
+            *(price_service.fetch_current_prices(exchange, list(symbols_by_exchange[exchange]))
+              for exchange in exchanges),
+            return_exceptions=True
+        )
+
+        # (exchange, symbol) -> price, or the exception that prevented fetching it
+        prices: Dict[tuple, object] = {}
+        for exchange, result in zip(exchanges, results):
+            for symbol in symbols_by_exchange[exchange]:
+                if isinstance(result, BaseException):
+                    prices[(exchange, symbol)] = result
+                elif symbol in result:
+                    prices[(exchange, symbol)] = result[symbol]
+                else:
+                    prices[(exchange, symbol)] = RuntimeError(f"No price for {exchange} {symbol}")
+
+        # Database updates, written in one batch each after the loop
+        pnl_updates = []
+        liquidation_updates = []
+        # Info for each queued liquidation, reported once the write succeeds
+        liquidation_candidates = []
+
+        # One timestamp for every liquidation in this check
+        now = datetime.now()
+        now_iso = now.isoformat()
+
+        for position in all_positions:
+            # Skip if already processed
+            if position.id in self._liquidated_positions:
+                continue
 
-            for position in all_positions:
-                # Skip if already processed
-                if position.id in self._liquidated_positions:
+            try:
+                current_price = prices[(position.exchange, position.symbol)]
+                if isinstance(current_price, BaseException):
+                    logger.error(f"Error checking position {position.id}: {current_price}")
                     continue
 
-                try:
-                    # Fetch current price
-                    price_service = get_price_service()
-                    current_price = await price_service.fetch_current_price(
-                        position.exchange,
-                        position.symbol
+                # Update unrealized PnL first (computed here instead of
+                # writing it and reloading the position)
+                position.unrealized_pnl = position.calculate_unrealized_pnl(current_price)
+                position.roi = position.calculate_roi(position.unrealized_pnl)
+                pnl_updates.append((position.id, position.unrealized_pnl, position.roi))
+
+                # Check if position should be liquidated
+                if position.is_liquidated(current_price):
+                    logger.info(
+                        f"Liquidating position {position.id} "
+                        f"(trader: {position.trader_id}, "
+                        f"{position.exchange} {position.symbol} "
+                        f"{position.position_side.value})"
                     )
 
-                    # Update unrealized PnL first
-                    pos_db.update_position_pnl(position.id, current_price)
+                    # Calculate realized PnL on liquidation
+                    # The margin was already deducted when opening the position
+                    # The actual loss is the unrealized PnL minus entry fee
+                    # (which was already deducted from balance)
+                    realized_pnl = position.unrealized_pnl - position.entry_fee
 
-                    # Reload position to get updated values
-                    position = pos_db.get_position(position.id)
-
-                    # Check if position should be liquidated
-                    if position.is_liquidated(current_price):
-                        logger.info(
-                            f"Liquidating position {position.id} "
-                            f"(trader: {position.trader_id}, "
-                            f"{position.exchange} {position.symbol} "
-                            f"{position.position_side.value})"
-                        )
-
-                        # Calculate realized PnL on liquidation
-                        # The margin was already deducted when opening the position
-                        # The actual loss is the unrealized PnL minus entry fee
-                        # (which was already deducted from balance)
-                        realized_pnl = position.unrealized_pnl - position.entry_fee
-
-                        # Update position status to liquidated
-                        pos_db.update_position_status(
-                            position.id,
-                            PositionStatus.LIQUIDATED,
-                            exit_price=current_price,
-                            exit_time=datetime.now(),
-                            realized_pnl=realized_pnl
-                        )
-
-                        # Track balance update for trader
-                        # Note: margin was already deducted when opening position
-                        # But we need to reflect that the margin is lost (no recovery)
-                        # In this system, margin is deducted on open, so we don't deduct again
-                        # The loss is already reflected in the unrealized PnL
-
-                        # Store liquidation info
-                        liquidated_positions.append({
-                            'position_id': position.id,
-                            'trader_id': position.trader_id,
-                            'exchange': position.exchange,
-                            'symbol': position.symbol,
-                            'side': position.position_side.value,
-                            'entry_price': position.entry_price,
-                            'liquidation_price': current_price,
-                            'margin': position.margin,
-                            'realized_pnl': realized_pnl,
-                            'liquidation_time': datetime.now().isoformat()
-                        })
-
-                        # Mark as processed
-                        self._liquidated_positions.add(position.id)
-
-                        # Queue trader equity update
-                        if position.trader_id not in trader_balance_updates:
-                            trader_balance_updates[position.trader_id] = 0
-                        # The loss is already in unrealized PnL, which will be reflected in equity
-                        # But we should update to mark it as realized
-
-                except Exception as e:
-                    logger.error(f"Error checking position {position.id}: {e}")
-                    continue
+                    # Queue position status update to liquidated
+                    liquidation_updates.append(
+                        (position.id, current_price, now, realized_pnl)
+                    )
 
-            # Update trader equity for all affected traders
-            for trader_id in trader_balance_updates.keys():
-                try:
-                    # Get total unrealized PnL for this trader
-                    positions = pos_db.list_positions(trader_id, status='open')
-                    total_unrealized_pnl = sum(p.unrealized_pnl for p in positions)
+                    # Track balance update for trader
+                    # Note: margin was already deducted when opening position
+                    # But we need to reflect that the margin is lost (no recovery)
+                    # In this system, margin is deducted on open, so we don't deduct again
+                    # The loss is already reflected in the unrealized PnL
+
+                    # Queue liquidation info
+                    liquidation_candidates.append({
+                        'position_id': position.id,
+                        'trader_id': position.trader_id,
+                        'exchange': position.exchange,
+                        'symbol': position.symbol,
+                        'side': position.position_side.value,
+                        'entry_price': position.entry_price,
+                        'liquidation_price': current_price,
+                        'margin': position.margin,
+                        'realized_pnl': realized_pnl,
+                        'liquidation_time': now_iso
+                    })
 
-                    # Update equity
-                    trader_db.update_equity_with_unrealized_pnl(trader_id, total_unrealized_pnl)
+            except Exception as e:
+                logger.error(f"Error checking position {position.id}: {e}")
+                continue
+
+        # PnL first: liquidation resets the unrealized PnL
+        pos_db.bulk_update_pnl(pnl_updates)
+        liquidated_ids = set(pos_db.bulk_update_liquidations(liquidation_updates))
+
+        # Only positions the write actually liquidated are reported and marked
+        # as processed; ones closed in the meantime were left untouched
+        for info in liquidation_candidates:
+            if info['position_id'] not in liquidated_ids:
+                continue
+            liquidated_positions.append(info)
+            self._liquidated_positions.add(info['position_id'])
+
+            # Queue trader equity update
+            # The loss is already in unrealized PnL, which will be reflected in equity
+            # But we should update to mark it as realized
+            trader_balance_updates.setdefault(info['trader_id'], 0)
+
+        # Sum the unrealized PnL of each affected trader's remaining open
+        # positions from the positions already in memory (the values just
+        # written above) instead of re-querying them per trader
+        candidate_ids = {update[0] for update in liquidation_updates}
+        for position in all_positions:
+            if position.trader_id in trader_balance_updates and position.id not in candidate_ids:
+                trader_balance_updates[position.trader_id] += position.unrealized_pnl
+
+        # Update trader equity for all affected traders in one batch
+        if trader_balance_updates:
+            try:
+                trader_db.bulk_update_equity(list(trader_balance_updates.items()))
+                for trader_id in trader_balance_updates:
                     logger.info(f"Updated equity for trader {trader_id}")
 
-                except Exception as e:
-                    logger.error(f"Error updating equity for trader {trader_id}: {e}")
-
-            return liquidated_positions
+            except Exception as e:
+                logger.error(
+                    f"Error updating equity for traders "
+                    f"{', '.join(trader_balance_updates)}: {e}"
+                )
 
-        finally:
-            pos_db.close()
-            trader_db.close()
+        return liquidated_positions
 
     async def start(self):
         """Start the liquidation monitor background task"""
@@ -169,6 +231,7 @@ class LiquidationMonitor:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        self._close_databases()
         logger.info("Liquidation monitor stopped")
 
     async def _monitor_loop(self):
@@ -228,13 +291,14 @@ class LiquidationMonitor:
             if position.is_liquidated(current_price):
                 # Calculate realized PnL
                 realized_pnl = position.unrealized_pnl - position.entry_fee
+                now = datetime.now()
 
                 # Update position
                 pos_db.update_position_status(
                     position_id,
                     PositionStatus.LIQUIDATED,
                     exit_price=current_price,
-                    exit_time=datetime.now(),
+                    exit_time=now,
                     realized_pnl=realized_pnl
                 )
 
@@ -248,7 +312,7 @@ class LiquidationMonitor:
                     'liquidation_price': current_price,
                     'margin': position.margin,
                     'realized_pnl': realized_pnl,
-                    'liquidation_time': datetime.now().isoformat()
+                    'liquidation_time': now.isoformat()
                 }
 
             return None
@@ -81,6 +81,13 @@ class Position:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
+    def __post_init__(self):
+        # Entry price and leverage are fixed once a position is opened, so the
+        # liquidation price is resolved here (for rows stored without one)
+        # rather than on every is_liquidated() check.
+        if self.liquidation_price is None and self.leverage:
+            self.liquidation_price = self.calculate_liquidation_price()
+
     def calculate_unrealized_pnl(self, current_price: float) -> float:
         """Calculate unrealized PnL based on current price
 
@@ -156,9 +163,6 @@ class Position:
         Returns:
             True if liquidated, False otherwise
         """
-        if self.liquidation_price is None:
-            self.liquidation_price = self.calculate_liquidation_price()
-
         if self.position_side == PositionSide.LONG:
             # Long position liquidated when price drops below liq price
             return current_price <= self.liquidation_price
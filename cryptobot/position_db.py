@@ -6,7 +6,7 @@ SQLite database for storing and managing contract trading positions.
 import sqlite3
 import json
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 from datetime import datetime
 
 from .position import Position, PositionSide, PositionStatus
@@ -72,13 +72,18 @@ class PositionDatabase:
             )
         """)
 
-        # Create indexes for common queries
+        # Create indexes for common queries. The composite indexes lead with
+        # the columns of the single-column indexes they replace, so open
+        # positions are found without scanning closed/liquidated history.
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_positions_trader_id ON positions(trader_id)
+            CREATE INDEX IF NOT EXISTS idx_positions_trader_status ON positions(trader_id, status)
         """)
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_positions_status ON positions(status)
+            CREATE INDEX IF NOT EXISTS idx_positions_status_exchange_symbol
+            ON positions(status, exchange, symbol)
         """)
+        cursor.execute("DROP INDEX IF EXISTS idx_positions_trader_id")
+        cursor.execute("DROP INDEX IF EXISTS idx_positions_status")
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_positions_symbol ON positions(symbol)
         """)
@@ -357,6 +362,88 @@ class PositionDatabase:
         self.conn.commit()
         return cursor.rowcount > 0
 
+    def bulk_update_pnl(self, rows: List[Tuple[int, float, float]]) -> int:
+        """Update unrealized PnL and ROI of many open positions at once
+
+        Args:
+            rows: List of (position_id, unrealized_pnl, roi) tuples
+
+        Returns:
+            Number of positions updated
+        """
+        if not self.conn:
+            self.initialize()
+
+        if not rows:
+            return 0
+
+        now = datetime.now().isoformat()
+        cursor = self.conn.cursor()
+        cursor.executemany("""
+            UPDATE positions
+            SET unrealized_pnl = ?,
+                roi = ?,
+                updated_at = ?
+            WHERE id = ? AND status = 'open'
+        """, [(pnl, roi, now, position_id) for position_id, pnl, roi in rows])
+
+        self.conn.commit()
+        return cursor.rowcount
+
+    def bulk_update_liquidations(self, rows: List[Tuple[int, float, datetime, float]]) -> List[int]:
+        """Mark many positions as liquidated in one transaction
+
+        Same field updates as update_position_status() with
+        PositionStatus.LIQUIDATED, applied to every row. Positions that were
+        closed in the meantime are left untouched.
+
+        Args:
+            rows: List of (position_id, exit_price, exit_time, realized_pnl) tuples
+
+        Returns:
+            IDs of the positions that were updated
+        """
+        if not self.conn:
+            self.initialize()
+
+        if not rows:
+            return []
+
+        params = []
+        for position_id, exit_price, exit_time, realized_pnl in rows:
+            exit_time_str = exit_time.isoformat()
+            params.append((
+                PositionStatus.LIQUIDATED.value, exit_time_str, exit_price,
+                exit_time_str, realized_pnl, realized_pnl, position_id,
+            ))
+
+        # One statement per row (still one commit) so each row's rowcount
+        # tells whether that position was still open
+        cursor = self.conn.cursor()
+        updated_ids = []
+        try:
+            for row in params:
+                cursor.execute("""
+                    UPDATE positions
+                    SET status = ?,
+                        updated_at = ?,
+                        exit_price = ?,
+                        exit_time = ?,
+                        realized_pnl = ?,
+                        roi = CASE WHEN margin > 0 THEN ? / margin * 100 ELSE roi END,
+                        unrealized_pnl = 0
+                    WHERE id = ? AND status = 'open'
+                """, row)
+                if cursor.rowcount:
+                    updated_ids.append(row[-1])
+        except Exception:
+            # Don't leave earlier rows pending for the next commit
+            self.conn.rollback()
+            raise
+
+        self.conn.commit()
+        return updated_ids
+
     def get_trader_positions_summary(self, trader_id: str) -> Dict[str, Any]:
         """Get summary statistics for a trader's positions
 
@@ -418,6 +505,82 @@ class PositionDatabase:
             ]
         }
 
+    def list_positions_sorted_with_summary(
+        self,
+        trader_id: str
+    ) -> Tuple[List[Position], Dict[str, Any]]:
+        """List a trader's positions by PnL together with summary statistics
+
+        Positions are ordered in SQL by unrealized PnL for open positions and
+        realized PnL otherwise (highest first, newest first on ties). The
+        aggregates are computed by SQLite in a single query, so callers that
+        display both do not need a second pass over the positions.
+
+        Args:
+            trader_id: Trader ID
+
+        Returns:
+            Tuple of (sorted Position objects, summary dictionary in the
+            same shape as get_trader_positions_summary)
+        """
+        if not self.conn:
+            self.initialize()
+
+        cursor = self.conn.cursor()
+
+        cursor.execute("""
+            SELECT * FROM positions
+            WHERE trader_id = ?
+            ORDER BY
+                CASE WHEN status = 'open' THEN unrealized_pnl ELSE realized_pnl END DESC,
+                created_at DESC
+        """, (trader_id,))
+        positions = [Position.from_db_row(row) for row in cursor.fetchall()]
+
+        if not positions:
+            return positions, {
+                'total_positions': 0,
+                'open_positions': 0,
+                'closed_positions': 0,
+                'liquidated_positions': 0,
+                'total_unrealized_pnl': 0.0,
+                'total_realized_pnl': 0.0,
+                'average_roi': 0.0,
+            }
+
+        cursor.execute("""
+            SELECT
+                COUNT(*) AS total_positions,
+                COALESCE(SUM(status = 'open'), 0) AS open_positions,
+                COALESCE(SUM(status = 'closed'), 0) AS closed_positions,
+                COALESCE(SUM(status = 'liquidated'), 0) AS liquidated_positions,
+                COALESCE(SUM(CASE WHEN status = 'open' THEN unrealized_pnl END), 0.0)
+                    AS total_unrealized_pnl,
+                COALESCE(SUM(CASE WHEN status IN ('closed', 'liquidated') THEN realized_pnl END), 0.0)
+                    AS total_realized_pnl,
+                COALESCE(AVG(CASE WHEN status = 'closed' AND margin > 0 THEN roi END), 0.0)
+                    AS average_roi
+            FROM positions
+            WHERE trader_id = ?
+        """, (trader_id,))
+        row = cursor.fetchone()
+
+        summary = {key: row[key] for key in row.keys()}
+        summary['open_position_details'] = [
+            {
+                'id': p.id,
+                'symbol': p.symbol,
+                'side': p.position_side.value,
+                'entry_price': p.entry_price,
+                'unrealized_pnl': p.unrealized_pnl,
+                'roi': p.roi,
+            }
+            for p in positions
+            if p.status == PositionStatus.OPEN
+        ]
+
+        return positions, summary
+
     def delete_position(self, position_id: int) -> bool:
         """Delete a position from the database
 
@@ -26,6 +26,8 @@ class PriceUpdateService:
         """
         self.cache_ttl = cache_ttl
         self.price_cache: Dict[str, tuple[float, float]] = {}  # key: (price, timestamp)
+        # Fetches in progress, shared by concurrent callers for the same key
+        self._inflight: Dict[str, asyncio.Task] = {}
 
     def _make_cache_key(self, exchange: str, symbol: str) -> str:
         """Create a cache key for the exchange/symbol pair
@@ -61,6 +63,31 @@ class PriceUpdateService:
             if time.time() - cached_time < self.cache_ttl:
                 return cached_price
 
+        # Join a fetch already in progress instead of sending another request
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_price(exchange, symbol, cache_key))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+
+        # Shielded so a cancelled caller does not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _fetch_price(self, exchange: str, symbol: str, cache_key: str) -> float:
+        """Fetch current price from exchange and cache it
+
+        Args:
+            exchange: Exchange name
+            symbol: Trading symbol (user format, e.g., BTCUSDT)
+            cache_key: Cache key for the exchange/symbol pair
+
+        Returns:
+            Current price
+
+        Raises:
+            ValueError: If exchange not supported or symbol not found
+            RuntimeError: If fetching price fails
+        """
         # Create exchange instance
         exchange_instance = create_exchange_instance(exchange)
 
@@ -86,6 +113,154 @@ class PriceUpdateService:
 
         return float(current_price)
 
+    async def fetch_current_prices(self, exchange: str, symbols: List[str]) -> Dict[str, float]:
+        """Fetch current prices of several symbols on one exchange with caching
+
+        Symbols missing from the cache are fetched with a single bulk ticker
+        request when the exchange supports it, one request per symbol otherwise.
+        Fetches already in progress for a symbol are joined, and the bulk fetch
+        is registered per symbol so single-symbol callers join it too.
+
+        Args:
+            exchange: Exchange name (binance, okx, bybit, bitget)
+            symbols: Trading symbols (user format, e.g., BTCUSDT)
+
+        Returns:
+            Dictionary mapping symbol to current price; symbols without a valid
+            price are left out
+
+        Raises:
+            ValueError: If exchange not supported
+            RuntimeError: If fetching prices fails
+        """
+        prices: Dict[str, float] = {}
+        uncached = []
+
+        # Check cache
+        for symbol in dict.fromkeys(symbols):
+            cached_price = self.get_cached_price(exchange, symbol)
+            if cached_price is not None:
+                prices[symbol] = cached_price
+            else:
+                uncached.append(symbol)
+
+        if not uncached:
+            return prices
+
+        # Create exchange instance
+        exchange_instance = create_exchange_instance(exchange)
+
+        if not exchange_instance.has.get('fetchTickers'):
+            results = await asyncio.gather(
+                *(self.fetch_current_price(exchange, symbol) for symbol in uncached),
+                return_exceptions=True
+            )
+            for symbol, result in zip(uncached, results):
+                if not isinstance(result, Exception):
+                    prices[symbol] = result
+            return prices
+
+        # Join fetches already in progress, bulk fetch the rest
+        tasks: Dict[str, asyncio.Task] = {}
+        missing = []
+        for symbol in uncached:
+            task = self._inflight.get(self._make_cache_key(exchange, symbol))
+            if task is not None:
+                tasks[symbol] = task
+            else:
+                missing.append(symbol)
+
+        bulk = None
+        if missing:
+            bulk = asyncio.ensure_future(self._fetch_prices(exchange_instance, exchange, missing))
+            for symbol in missing:
+                cache_key = self._make_cache_key(exchange, symbol)
+                task = asyncio.ensure_future(self._pick_price(bulk, exchange, symbol))
+                self._inflight[cache_key] = task
+                task.add_done_callback(lambda _, key=cache_key: self._inflight.pop(key, None))
+                tasks[symbol] = task
+
+        # Shielded so a cancelled caller does not cancel the fetches for the others
+        results = await asyncio.gather(
+            *(asyncio.shield(task) for task in tasks.values()),
+            return_exceptions=True
+        )
+        if bulk is not None and not bulk.cancelled() and bulk.exception() is not None:
+            raise bulk.exception()
+
+        for symbol, result in zip(tasks, results):
+            if not isinstance(result, BaseException):
+                prices[symbol] = result
+
+        return prices
+
+    async def _fetch_prices(self, exchange_instance, exchange: str, symbols: List[str]) -> Dict[str, float]:
+        """Fetch current prices with one bulk ticker request and cache them
+
+        Args:
+            exchange_instance: CCXT exchange instance supporting fetchTickers
+            exchange: Exchange name
+            symbols: Trading symbols (user format, e.g., BTCUSDT)
+
+        Returns:
+            Dictionary mapping symbol to current price; symbols without a valid
+            price are left out
+
+        Raises:
+            RuntimeError: If fetching prices fails
+        """
+        def fetch_tickers() -> tuple:
+            # Tickers are keyed by unified symbol, so resolve those first
+            exchange_instance.load_markets()
+            unified_symbols = {}
+            for symbol in symbols:
+                try:
+                    ccxt_symbol = convert_user_symbol_to_ccxt(exchange, symbol)
+                    unified_symbols[symbol] = exchange_instance.market(ccxt_symbol)['symbol']
+                except Exception:
+                    continue
+            if not unified_symbols:
+                return unified_symbols, {}
+            return unified_symbols, exchange_instance.fetch_tickers(list(unified_symbols.values()))
+
+        # Fetch tickers
+        try:
+            loop = asyncio.get_event_loop()
+            unified_symbols, tickers = await loop.run_in_executor(None, fetch_tickers)
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch prices {exchange}: {e}")
+
+        # Update cache
+        prices: Dict[str, float] = {}
+        now = time.time()
+        for symbol, unified_symbol in unified_symbols.items():
+            current_price = (tickers.get(unified_symbol) or {}).get('last')
+            if current_price is None or current_price <= 0:
+                continue
+            prices[symbol] = float(current_price)
+            self.price_cache[self._make_cache_key(exchange, symbol)] = (float(current_price), now)
+
+        return prices
+
+    async def _pick_price(self, bulk: asyncio.Future, exchange: str, symbol: str) -> float:
+        """Wait for a bulk fetch and return one symbol's price from it
+
+        Args:
+            bulk: Task running _fetch_prices
+            exchange: Exchange name
+            symbol: Trading symbol (user format, e.g., BTCUSDT)
+
+        Returns:
+            Current price
+
+        Raises:
+            RuntimeError: If the bulk fetch failed or returned no valid price for the symbol
+        """
+        prices = await bulk
+        if symbol not in prices:
+            raise RuntimeError(f"Failed to fetch price {exchange} {symbol}: no valid ticker")
+        return prices[symbol]
+
     async def update_trader_positions(self, trader_id: str, db: PositionDatabase) -> List[Position]:
         """Update all open positions for a trader with current prices
 
@@ -28,6 +28,11 @@ class SchedulerConfig:
         'indicator.limit': ('0', 'int', 'Indicator data limit (0 = unlimited)'),
         'indicator.exchange': ('okx', 'string', 'Default exchange for indicators (okx, binance, etc.)'),
 
+        # AI settings
+        'ai.backend': ('claude_code', 'string', 'Decision backend: claude_code (CLI subprocess) or api (Anthropic API client)'),
+        'ai.model': ('claude-sonnet-4-5', 'string', 'Model used when ai.backend is api'),
+        'ai.max_tokens': ('4096', 'int', 'Maximum response tokens when ai.backend is api'),
+
         # Optimization settings
         'optimize.enabled': ('false', 'bool', 'Enable automatic optimization'),
         'optimize.min_positions': ('5', 'int', 'Minimum positions before optimization'),
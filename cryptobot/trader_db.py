@@ -3,12 +3,16 @@
 SQLite database for storing and managing trader metadata.
 """
 
+import re
 import sqlite3
 import json
 from pathlib import Path
 from typing import Optional, Dict, List, Any, Tuple
 from datetime import datetime
 
+# Runs of ASCII digits in a trader ID; the last run is its number
+_ID_NUMBER_RE = re.compile(r'[0-9]+')
+
 
 class TraderDatabase:
     """SQLite database for trader metadata storage"""
@@ -138,6 +142,74 @@ class TraderDatabase:
         if not self.conn:
             self.initialize()
 
+        try:
+            self._insert_trader(trader_data)
+            self.conn.commit()
+            return True
+        except sqlite3.IntegrityError:
+            # Trader with this ID already exists
+            return False
+        except Exception as e:
+            self.conn.rollback()
+            raise e
+
+    def add_traders_bulk(self, records: List[Dict[str, Any]]) -> List[bool]:
+        """Add several traders in a single transaction
+
+        The whole batch runs inside one outer savepoint and each record is
+        inserted under its own nested savepoint, so a duplicate ID only skips
+        that record. Everything is committed once at the end.
+
+        Args:
+            records: List of trader dictionaries (same format as add_trader)
+
+        Returns:
+            List of booleans, one per record, True if that trader was added
+
+        Raises:
+            ValueError: If validation fails for a record. The failing record is
+                rolled back and the records added before it are committed.
+        """
+        if not self.conn:
+            self.initialize()
+
+        results = []
+        cursor = self.conn.cursor()
+
+        # Outer savepoint opens the transaction; the per-record savepoints are
+        # nested inside it so releasing them does not commit.
+        cursor.execute("SAVEPOINT add_traders_bulk")
+        for trader_data in records:
+            cursor.execute("SAVEPOINT add_trader")
+            try:
+                self._insert_trader(trader_data)
+            except sqlite3.IntegrityError:
+                cursor.execute("ROLLBACK TO SAVEPOINT add_trader")
+                results.append(False)
+            except Exception:
+                cursor.execute("ROLLBACK TO SAVEPOINT add_trader")
+                cursor.execute("RELEASE SAVEPOINT add_trader")
+                cursor.execute("RELEASE SAVEPOINT add_traders_bulk")
+                self.conn.commit()
+                raise
+            else:
+                results.append(True)
+            cursor.execute("RELEASE SAVEPOINT add_trader")
+
+        cursor.execute("RELEASE SAVEPOINT add_traders_bulk")
+        self.conn.commit()
+        return results
+
+    def _insert_trader(self, trader_data: Dict[str, Any]):
+        """Insert a trader row and its pair/interval associations without committing
+
+        Args:
+            trader_data: Trader dictionary (see add_trader)
+
+        Raises:
+            sqlite3.IntegrityError: If a trader with this ID already exists
+            ValueError: If validation fails
+        """
         # Extract pairs and intervals for relational storage
         trading_pairs = trader_data.pop('trading_pairs', [])
         timeframes = trader_data.pop('timeframes', [])
@@ -169,46 +241,36 @@ class TraderDatabase:
 
         cursor = self.conn.cursor()
 
-        try:
-            cursor.execute("""
-                INSERT INTO traders (
-                    id, trader_file, characteristics, style, strategy,
-                    trading_pairs, timeframes, indicators, information_sources,
-                    prompt, diversity_score, metadata, initial_balance, current_balance, equity
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                trader_data['id'],
-                trader_data['trader_file'],
-                json.dumps(trader_data.get('characteristics', {})),
-                trader_data.get('style', ''),
-                json.dumps(trader_data.get('strategy', {})),
-                json.dumps([]),  # Empty array for deprecated field
-                json.dumps([]),  # Empty array for deprecated field
-                json.dumps(trader_data.get('indicators', [])),
-                json.dumps(trader_data.get('information_sources', [])),
-                trader_data.get('prompt', ''),
-                trader_data.get('diversity_score'),
-                json.dumps(trader_data.get('metadata', {})),
-                trader_data.get('initial_balance', 10000.0),
-                trader_data.get('current_balance', 10000.0),
-                trader_data.get('equity', 10000.0)
-            ))
-
-            # Create relational associations
-            trader_id = trader_data['id']
-            if trading_pairs:
-                self.add_trader_pairs(trader_id, trading_pairs)
-            if timeframes:
-                self.add_trader_intervals(trader_id, timeframes)
-
-            self.conn.commit()
-            return True
-        except sqlite3.IntegrityError:
-            # Trader with this ID already exists
-            return False
-        except Exception as e:
-            self.conn.rollback()
-            raise e
+        cursor.execute("""
+            INSERT INTO traders (
+                id, trader_file, characteristics, style, strategy,
+                trading_pairs, timeframes, indicators, information_sources,
+                prompt, diversity_score, metadata, initial_balance, current_balance, equity
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            trader_data['id'],
+            trader_data['trader_file'],
+            json.dumps(trader_data.get('characteristics', {})),
+            trader_data.get('style', ''),
+            json.dumps(trader_data.get('strategy', {})),
+            json.dumps([]),  # Empty array for deprecated field
+            json.dumps([]),  # Empty array for deprecated field
+            json.dumps(trader_data.get('indicators', [])),
+            json.dumps(trader_data.get('information_sources', [])),
+            trader_data.get('prompt', ''),
+            trader_data.get('diversity_score'),
+            json.dumps(trader_data.get('metadata', {})),
+            trader_data.get('initial_balance', 10000.0),
+            trader_data.get('current_balance', 10000.0),
+            trader_data.get('equity', 10000.0)
+        ))
+
+        # Create relational associations
+        trader_id = trader_data['id']
+        if trading_pairs:
+            self.add_trader_pairs(trader_id, trading_pairs, commit=False)
+        if timeframes:
+            self.add_trader_intervals(trader_id, timeframes, commit=False)
 
     def _truncate_to_constraints(
         self,
@@ -530,6 +592,34 @@ class TraderDatabase:
         rows = cursor.fetchall()
         return [self._row_to_dict(row) for row in rows]
 
+    def get_max_numeric_id(self) -> int:
+        """Get the largest numeric trader ID
+
+        The number of an ID is its last run of ASCII digits, wherever it is:
+        '12' -> 12, 'QuantumTrader_12' -> 12, 'Trader12x' -> 12. IDs ending
+        in a digit (the usual case) are handled entirely in SQL; the few that
+        have digits followed by other characters are checked in Python.
+
+        Returns:
+            Largest numeric ID, or 0 if there are no numbered traders
+        """
+        if not self.conn:
+            self.initialize()
+
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT MAX(CAST(substr(id, length(rtrim(id, '0123456789')) + 1) AS INTEGER)) AS max_id
+            FROM traders
+            WHERE id GLOB '*[0-9]'
+        """)
+        max_id = cursor.fetchone()['max_id'] or 0
+
+        cursor.execute("SELECT id FROM traders WHERE id GLOB '*[0-9]*[^0-9]'")
+        for row in cursor:
+            max_id = max(max_id, int(_ID_NUMBER_RE.findall(row['id'])[-1]))
+
+        return max_id
+
     def get_all_trader_summaries(self) -> List[Dict[str, Any]]:
         """Get summary information for all traders
 
@@ -760,30 +850,50 @@ class TraderDatabase:
 
         cursor = self.conn.cursor()
 
-        # Get current values
-        cursor.execute("SELECT current_balance, equity FROM traders WHERE id = ?", (trader_id,))
-        row = cursor.fetchone()
+        # Apply the change in one statement; column references on the right
+        # hand side see the pre-update balance. If equity_change is not
+        # provided, equity is set equal to the new balance (callers should
+        # update equity separately with unrealized PnL if needed)
+        cursor.execute("""
+            UPDATE traders
+            SET current_balance = current_balance + ?,
+                equity = COALESCE(?, current_balance + ?)
+            WHERE id = ?
+        """, (balance_change, equity_change, balance_change, trader_id))
 
-        if not row:
-            return False
+        self.conn.commit()
+        return cursor.rowcount > 0
 
-        current_balance = row['current_balance']
-        new_balance = current_balance + balance_change
+    def apply_close(
+        self,
+        trader_id: str,
+        balance_delta: float,
+        total_unrealized_pnl: float
+    ) -> bool:
+        """Credit a closed position and refresh equity in a single UPDATE
 
-        # Calculate equity
-        if equity_change is not None:
-            new_equity = equity_change
-        else:
-            # If equity_change not provided, set equity equal to balance
-            # (Callers should update equity separately with unrealized PnL if needed)
-            new_equity = new_balance
+        Equivalent to update_balance_and_equity() followed by
+        update_equity_with_unrealized_pnl(), with one write and one commit.
+
+        Args:
+            trader_id: Unique trader identifier
+            balance_delta: Amount to add to current_balance (margin + realized PnL)
+            total_unrealized_pnl: Unrealized PnL of the trader's remaining open positions
+
+        Returns:
+            True if updated, False if trader not found
+        """
+        if not self.conn:
+            self.initialize()
+
+        cursor = self.conn.cursor()
 
-        # Update
         cursor.execute("""
             UPDATE traders
-            SET current_balance = ?, equity = ?
+            SET current_balance = current_balance + ?,
+                equity = current_balance + ? + ?
             WHERE id = ?
-        """, (new_balance, new_equity, trader_id))
+        """, (balance_delta, balance_delta, total_unrealized_pnl, trader_id))
 
         self.conn.commit()
         return cursor.rowcount > 0
@@ -827,6 +937,34 @@ class TraderDatabase:
         self.conn.commit()
         return cursor.rowcount > 0
 
+    def bulk_update_equity(self, rows: List[Tuple[str, float]]) -> int:
+        """Update equity of many traders from their unrealized PnL at once
+
+        Same result as update_equity_with_unrealized_pnl() for every row,
+        with the balance read folded into the UPDATE and a single commit.
+
+        Args:
+            rows: List of (trader_id, unrealized_pnl) tuples
+
+        Returns:
+            Number of traders updated
+        """
+        if not self.conn:
+            self.initialize()
+
+        if not rows:
+            return 0
+
+        cursor = self.conn.cursor()
+        cursor.executemany("""
+            UPDATE traders
+            SET equity = current_balance + ?
+            WHERE id = ?
+        """, [(unrealized_pnl, trader_id) for trader_id, unrealized_pnl in rows])
+
+        self.conn.commit()
+        return cursor.rowcount
+
     # =============================================================================
     # Pairs and Intervals Relational Tables
     # =============================================================================
@@ -992,13 +1130,20 @@ class TraderDatabase:
         cursor.execute("SELECT * FROM intervals ORDER BY seconds")
         return [dict(row) for row in cursor.fetchall()]
 
-    def add_trader_pairs(self, trader_id: str, pair_symbols: List[str], exchange: str = None):
+    def add_trader_pairs(
+        self,
+        trader_id: str,
+        pair_symbols: List[str],
+        exchange: str = None,
+        commit: bool = True
+    ):
         """Associate pairs with a trader
 
         Args:
             trader_id: Trader ID
             pair_symbols: List of pair symbols (e.g., ['BTCUSDT', 'ETHUSDT'])
             exchange: Exchange name (default: from config, usually 'okx')
+            commit: Commit after inserting (False when called inside a larger transaction)
 
         Raises:
             ValueError: If total pairs exceed maximum allowed
@@ -1051,14 +1196,16 @@ class TraderDatabase:
             except sqlite3.IntegrityError:
                 pass  # Already exists
 
-        self.conn.commit()
+        if commit:
+            self.conn.commit()
 
-    def add_trader_intervals(self, trader_id: str, interval_codes: List[str]):
+    def add_trader_intervals(self, trader_id: str, interval_codes: List[str], commit: bool = True):
         """Associate intervals with a trader
 
         Args:
             trader_id: Trader ID
             interval_codes: List of interval codes (e.g., ['1h', '4h', '1d'])
+            commit: Commit after inserting (False when called inside a larger transaction)
 
         Raises:
             ValueError: If intervals exceed maximum, or interval is below minimum
@@ -1122,7 +1269,8 @@ class TraderDatabase:
                 except sqlite3.IntegrityError:
                     pass  # Already exists
 
-        self.conn.commit()
+        if commit:
+            self.conn.commit()
 
     def get_trader_pairs(self, trader_id: str) -> List[Dict[str, Any]]:
         """Get all pairs for a trader"""
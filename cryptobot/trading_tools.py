@@ -10,6 +10,10 @@ from dataclasses import dataclass
 import asyncio
 
 
+# Maximum number of positions closed at once by close_all_positions
+CLOSE_ALL_CONCURRENCY = 8
+
+
 @dataclass
 class PositionResult:
     """Result of a position operation"""
@@ -177,9 +181,6 @@ class TradingTools:
             unrealized_pnl=0.0,
         )
 
-        # Calculate liquidation price
-        position.liquidation_price = position.calculate_liquidation_price()
-
         try:
             # Save to database
             position_id = self.position_db.add_position(position)
@@ -288,16 +289,14 @@ class TradingTools:
             updated_position = self.position_db.get_position(position_id)
             pnl = updated_position.realized_pnl if updated_position else 0.0
 
-            # Update trader balance (equity will be updated with unrealized PnL separately)
-            self.trader_db.update_balance_and_equity(
-                position.trader_id,
-                balance_change=position.margin + pnl
-            )
-
-            # Update equity with current unrealized PnL (should be 0 for closed positions)
+            # Update trader balance and equity with current unrealized PnL in one write
             # Get fresh summary to ensure we have the latest unrealized PnL
             summary = self.position_db.get_trader_positions_summary(position.trader_id)
-            self.trader_db.update_equity_with_unrealized_pnl(position.trader_id, summary['total_unrealized_pnl'])
+            self.trader_db.apply_close(
+                position.trader_id,
+                position.margin + pnl,
+                summary['total_unrealized_pnl']
+            )
 
             self.console.print(f"[green]✓ Position closed via AI tool call[/green]")
             self.console.print(f"  [dim]ID: {position_id}[/dim]")
@@ -350,11 +349,24 @@ class TradingTools:
                 trader_id=trader_id
             )
 
+        # Close concurrently, bounded to stay within exchange rate limits
+        semaphore = asyncio.Semaphore(CLOSE_ALL_CONCURRENCY)
+
+        async def close_one(position_id: int) -> PositionResult:
+            async with semaphore:
+                return await self.close_position(position_id)
+
+        results = await asyncio.gather(
+            *(close_one(pos.id) for pos in positions),
+            return_exceptions=True
+        )
+
         closed_count = 0
         total_pnl = 0.0
 
-        for pos in positions:
-            result = await self.close_position(pos.id)
+        for result in results:
+            if isinstance(result, Exception):
+                continue
             if result.success:
                 closed_count += 1
                 # Extract PnL from result
@@ -8,6 +8,7 @@ Output: CSV format (side,price,volume)
 
 import ccxt
 import argparse
+import asyncio
 from typing import List, Tuple
 from pathlib import Path
 
@@ -29,7 +30,9 @@ def fetch_orderbook(exchange: str, symbol: str, limit: int = 20) -> List[Tuple[s
 
     try:
         import sys
-        sys.path.insert(0, str(Path(__file__).parent.parent))
+        project_root = str(Path(__file__).parent.parent)
+        if project_root not in sys.path:
+            sys.path.insert(0, project_root)
         from cryptobot.ccxt_adapter import convert_user_symbol_to_ccxt
 
         ccxt_symbol = convert_user_symbol_to_ccxt(exchange, symbol)
@@ -56,6 +59,33 @@ def fetch_orderbook(exchange: str, symbol: str, limit: int = 20) -> List[Tuple[s
         pass
 
 
+async def run(exchange: str, symbol: str, limit: int = 20) -> str:
+    """
+    Fetch order book snapshot in-process
+
+    Lets cryptobot call this indicator without spawning a Python subprocess.
+
+    Args:
+        exchange: Exchange name (binance, okx, bybit, bitget)
+        symbol: Trading symbol (e.g., BTCUSDT)
+        limit: Order book depth
+
+    Returns:
+        CSV text, as printed by the script
+    """
+    try:
+        data = await asyncio.to_thread(fetch_orderbook, exchange, symbol, limit)
+    except Exception as e:
+        return f"error,{str(e)}\n"
+
+    if not data:
+        return "error,no data available\n"
+
+    lines = ["side,price,volume"]
+    lines.extend(f"{side},{price},{volume}" for side, price, volume in data)
+    return '\n'.join(lines) + '\n'
+
+
 def main():
     parser = argparse.ArgumentParser(description='Fetch order book snapshot')
     parser.add_argument('--exchange', required=True, help='Exchange name')
@@ -64,20 +94,7 @@ def main():
 
     args = parser.parse_args()
 
-    try:
-        data = fetch_orderbook(args.exchange, args.symbol, args.limit)
-
-        if not data:
-            print("error,no data available")
-            return
-
-        # CSV output
-        print("side,price,volume")
-        for side, price, volume in data:
-            print(f"{side},{price},{volume}")
-
-    except Exception as e:
-        print(f"error,{str(e)}")
+    print(asyncio.run(run(args.exchange, args.symbol, args.limit)), end='')
 
 
 if __name__ == '__main__':
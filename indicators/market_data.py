@@ -8,6 +8,7 @@ Output: CSV format (open,high,low,close,volume)
 
 import ccxt
 import argparse
+import asyncio
 from typing import List, Tuple
 from pathlib import Path
 
@@ -30,7 +31,9 @@ def fetch_market_snapshot(exchange: str, symbol: str, interval: str = '1h', limi
 
     try:
         import sys
-        sys.path.insert(0, str(Path(__file__).parent.parent))
+        project_root = str(Path(__file__).parent.parent)
+        if project_root not in sys.path:
+            sys.path.insert(0, project_root)
         from cryptobot.ccxt_adapter import (
             convert_user_symbol_to_ccxt,
             TIMEFRAME_MAP
@@ -63,6 +66,34 @@ def fetch_market_snapshot(exchange: str, symbol: str, interval: str = '1h', limi
         pass
 
 
+async def run(exchange: str, symbol: str, interval: str = '1h', limit: int = 100) -> str:
+    """
+    Fetch market data snapshot in-process
+
+    Lets cryptobot call this indicator without spawning a Python subprocess.
+
+    Args:
+        exchange: Exchange name
+        symbol: Trading symbol
+        interval: Timeframe
+        limit: Number of candles
+
+    Returns:
+        CSV text, as printed by the script
+    """
+    try:
+        data = await asyncio.to_thread(fetch_market_snapshot, exchange, symbol, interval, limit)
+    except Exception as e:
+        return f"error,{str(e)}\n"
+
+    if not data:
+        return "error,no data available\n"
+
+    lines = ["open,high,low,close,volume"]
+    lines.extend(f"{row[0]},{row[1]},{row[2]},{row[3]},{row[4]}" for row in data)
+    return '\n'.join(lines) + '\n'
+
+
 def main():
     parser = argparse.ArgumentParser(description='Fetch market data snapshot')
     parser.add_argument('--exchange', required=True, help='Exchange name')
@@ -72,20 +103,7 @@ def main():
 
     args = parser.parse_args()
 
-    try:
-        data = fetch_market_snapshot(args.exchange, args.symbol, args.interval, args.limit)
-
-        if not data:
-            print("error,no data available")
-            return
-
-        # CSV output
-        print("open,high,low,close,volume")
-        for row in data:
-            print(f"{row[0]},{row[1]},{row[2]},{row[3]},{row[4]}")
-
-    except Exception as e:
-        print(f"error,{str(e)}")
+    print(asyncio.run(run(args.exchange, args.symbol, args.interval, args.limit)), end='')
 
 
 if __name__ == '__main__':